@@ -1,17 +1,193 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                             QComboBox, QMainWindow, QGroupBox, QCalendarWidget,
                             QFrame, QTextEdit, QPushButton, QScrollArea, QSplitter)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import (Qt, QTimer, QStringListModel, QObject, QRunnable,
+                          QThreadPool, pyqtSignal)
 from PyQt5.QtGui import QFont
 from attendance_manager import AttendanceChartWidget
-import matplotlib.pyplot as plt
+import os
+import bisect
+import weakref
+from datetime import date, timedelta
 
-class AnalyticsWindow(QMainWindow):
+# Length of each view period in days
+_PERIOD_DAYS = {"Weekly": 7, "Monthly": 30, "Semester": 180}
+
+# View period names as understood by AttendanceManager.get_attendance_trend
+_TREND_PERIODS = {"Weekly": "week", "Monthly": "month", "Semester": "semester"}
+
+# Static QSS lives in styles/ and is read once at import
+_STYLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'styles')
+
+def _load_stylesheet(name):
+    """Read a stylesheet from the styles directory"""
+    with open(os.path.join(_STYLES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+_WINDOW_STYLESHEET = _load_stylesheet("analytics_window.qss")
+_TAB_STYLESHEET = _load_stylesheet("analytics_tab.qss")
+
+# Summary shown for a single student, filled with format_map
+_STUDENT_TEMPLATE = """👤 Student: {student}
+
+📊 Attendance Summary:
+• Total Days: {total_days}
+• Days Present: {days_present}
+• Days Absent: {days_absent}
+• Attendance Rate: {attendance_percentage:.1f}%"""
+
+
+class _LookupCache:
+    """Memoized AttendanceManager lookups, invalidated per changed date"""
+    
+    def __init__(self):
+        self.attendance = {}     # date_iso -> record
+        self.student_stats = {}  # (student, start_iso, end_iso) -> stats
+        self.trends = {}         # (period, today_iso) -> trend data
+    
+    def invalidate(self, date_iso=None):
+        """Drop only the entries that can depend on the given date"""
+        if date_iso is None:
+            self.attendance.clear()
+            self.student_stats.clear()
+            self.trends.clear()
+            return
+        self.attendance.pop(date_iso, None)
+        stale = [key for key in self.student_stats
+                 if (key[1] is None or key[1] <= date_iso) and
+                    (key[2] is None or date_iso <= key[2])]
+        for key in stale:
+            del self.student_stats[key]
+        # Changes are almost always to today's record, which every trend window covers
+        self.trends.clear()
+
+
+# One cache per AttendanceManager, shared by every analytics view
+_lookup_caches = weakref.WeakKeyDictionary()
+
+def _lookup_cache(manager):
+    """Return the lookup cache shared by all views of a manager"""
+    cache = _lookup_caches.get(manager)
+    if cache is None:
+        cache = _lookup_caches[manager] = _LookupCache()
+        manager.add_change_listener(cache.invalidate)
+    return cache
+
+
+class _ChartJobSignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object, str)
+
+
+class _ChartJob(QRunnable):
+    """Fetch the chart data for one selection on a worker thread"""
+    
+    def __init__(self, manager, request):
+        super().__init__()
+        self.manager = manager
+        self.request = request
+        self.signals = _ChartJobSignals()
+        
+    def run(self):
+        request = self.request
+        try:
+            if request['stats_key']:
+                request['student_stats'] = self.manager.get_student_attendance_stats(*request['stats_key'])
+            request['trend_data'] = self.manager.get_attendance_trend(period=request['trend_key'][0])
+        except Exception as e:
+            self.signals.failed.emit(request, str(e))
+            return
+        self.signals.finished.emit(request)
+
+
+class _AnalyticsBase:
+    """Widget builders and cached data access shared by the analytics views"""
+    
+    def _build_calendar_group(self, title):
+        """Create the date picker group and store the calendar on self.calendar"""
+        calendar_group = QGroupBox(title)
+        calendar_layout = QVBoxLayout(calendar_group)
+        self.calendar = QCalendarWidget()
+        self.calendar.setGridVisible(True)
+        calendar_layout.addWidget(self.calendar)
+        return calendar_group
+    
+    def _build_student_selector(self):
+        """Create the student dropdown and store it on self.student_selector"""
+        self.student_selector = QComboBox()
+        self.student_selector.setMaxVisibleItems(15)
+        # Backed by a string list model so a roster change is a single model reset
+        self._student_model = QStringListModel(self.student_selector)
+        self.student_selector.setModel(self._student_model)
+        return self.student_selector
+    
+    def _set_student_items(self, students):
+        """Replace the dropdown entries without emitting selection signals"""
+        selector = self.student_selector
+        selector.blockSignals(True)
+        try:
+            self._student_model.setStringList(students)
+            if selector.currentIndex() < 0 and students:
+                selector.setCurrentIndex(0)
+        finally:
+            selector.blockSignals(False)
+    
+    def _build_chart_panel(self, title):
+        """Create a titled group box for charts and return it with its layout"""
+        group = QGroupBox(title)
+        return group, QVBoxLayout(group)
+    
+    def _update_roster(self, students):
+        """Bring self._sorted_students in line with students, return True if it changed"""
+        old = self._students_cache
+        if students == old:
+            return False
+        roster = self._sorted_students
+        for name in old - students:
+            del roster[bisect.bisect_left(roster, name)]
+        for name in students - old:
+            bisect.insort(roster, name)
+        self._students_cache = students
+        return True
+    
+    def _get_attendance(self, day):
+        """Cached AttendanceManager.get_attendance"""
+        cache = _lookup_cache(self.attendance_manager).attendance
+        key = day.isoformat()
+        if key not in cache:
+            cache[key] = self.attendance_manager.get_attendance(day)
+        return cache[key]
+    
+    def _get_student_stats(self, student, start_date=None, end_date=None):
+        """Cached AttendanceManager.get_student_attendance_stats"""
+        cache = _lookup_cache(self.attendance_manager).student_stats
+        key = (student, start_date, end_date)
+        if key not in cache:
+            cache[key] = self.attendance_manager.get_student_attendance_stats(
+                student, start_date, end_date)
+        return cache[key]
+
+
+class AnalyticsWindow(QMainWindow, _AnalyticsBase):
     def __init__(self, attendance_manager, parent=None):
         super().__init__(parent)
         self.attendance_manager = attendance_manager
         self.setWindowTitle("Attendance Analytics")
         self.setMinimumSize(1200, 800)  # Increased window size
+        self.setStyleSheet(_WINDOW_STYLESHEET)
+        
+        # Coalesce bursts of selection changes into a single update
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(150)
+        self._update_timer.timeout.connect(self._do_update_analytics)
+        self._last_key = None
+        self._last_chart_key = None
+        self._students_cache = frozenset()
+        self._sorted_students = []
+        self._range_cache = {}
+        # Incremented per chart request so results of superseded jobs are dropped
+        self._chart_token = 0
         
         # Create central widget and main layout
         central_widget = QWidget()
@@ -23,37 +199,17 @@ class AnalyticsWindow(QMainWindow):
         # Left Panel: Calendar and Controls
         left_panel = QWidget()
         left_panel.setFixedWidth(400)  # Fixed width for left panel
-        left_panel.setStyleSheet("background-color: #f5f5f7;")
+        left_panel.setObjectName("leftPanel")
         left_layout = QVBoxLayout(left_panel)
         left_layout.setSpacing(20)
         left_layout.setContentsMargins(20, 20, 20, 20)
         
         # Calendar widget
-        calendar_group = QGroupBox("📅 Select Date Range")
-        calendar_group.setStyleSheet("""
-            QGroupBox {
-                font-size: 22px;
-                font-weight: bold;
-                border: 2px solid #d2d2d7;
-                border-radius: 12px;
-                margin-top: 16px;
-                padding: 20px;
-                background-color: Black;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 20px;
-                padding: 0 10px;
-                color: #1d1d1f;
-            }
-        """)
-        calendar_layout = QVBoxLayout(calendar_group)
-        self.calendar = QCalendarWidget()
-        self.calendar.setGridVisible(True)
+        calendar_group = self._build_calendar_group("📅 Select Date Range")
+        calendar_group.setObjectName("calendarGroup")
         self.calendar.setVerticalHeaderFormat(QCalendarWidget.NoVerticalHeader)
         self.calendar.setHorizontalHeaderFormat(QCalendarWidget.SingleLetterDayNames)
-        self.calendar.clicked.connect(self.update_analytics)
-        calendar_layout.addWidget(self.calendar)
+        self.calendar.selectionChanged.connect(self.update_analytics)
         left_layout.addWidget(calendar_group)
         
         # Controls section
@@ -63,8 +219,8 @@ class AnalyticsWindow(QMainWindow):
         # Student selection
         student_layout = QVBoxLayout()
         student_label = QLabel("Select Student:")
-        student_label.setStyleSheet("font-size: 16px; font-weight: bold; margin-bottom: 5px;")
-        self.student_selector = QComboBox()
+        student_label.setObjectName("controlLabel")
+        self._build_student_selector()
         self.student_selector.setMinimumHeight(40)
         self.student_selector.currentTextChanged.connect(self.update_analytics)
         
@@ -75,7 +231,7 @@ class AnalyticsWindow(QMainWindow):
         # Period selection
         period_layout = QVBoxLayout()
         period_label = QLabel("View Period:")
-        period_label.setStyleSheet("font-size: 16px; font-weight: bold; margin-bottom: 5px;")
+        period_label.setObjectName("controlLabel")
         self.period_selector = QComboBox()
         self.period_selector.setMinimumHeight(40)
         self.period_selector.addItems(["Weekly", "Monthly", "Semester"])
@@ -97,17 +253,23 @@ class AnalyticsWindow(QMainWindow):
         # Header
         header = QLabel("📊 Attendance Analytics Dashboard")
         header.setFont(QFont("SF Pro Display", 28, QFont.Bold))
-        header.setStyleSheet("color: #0071e3; margin-bottom: 20px;")
+        header.setObjectName("dashboardHeader")
         right_layout.addWidget(header)
         
         # Statistics cards in a grid
         stats_layout = QHBoxLayout()
         stats_layout.setSpacing(10)
         self.stat_cards = {}
-        self.stat_cards["total"] = self._create_stat_card("Total Students", "0")
-        self.stat_cards["present"] = self._create_stat_card("Present", "0", "#34c759")
-        self.stat_cards["absent"] = self._create_stat_card("Absent", "0", "#ff3b30")
-        self.stat_cards["percentage"] = self._create_stat_card("Attendance Rate", "0%", "#0071e3")
+        self.stat_value_labels = {}
+        for key, title, value, color in (
+            ("total", "Total Students", "0", "#1d1d1f"),
+            ("present", "Present", "0", "#34c759"),
+            ("absent", "Absent", "0", "#ff3b30"),
+            ("percentage", "Attendance Rate", "0%", "#0071e3"),
+        ):
+            card, value_label = self._create_stat_card(title, value, color)
+            self.stat_cards[key] = card
+            self.stat_value_labels[key] = value_label
         
         for card in self.stat_cards.values():
             stats_layout.addWidget(card)
@@ -117,22 +279,13 @@ class AnalyticsWindow(QMainWindow):
         charts_group = QGroupBox("📊 Attendance Visualization")
         charts_layout = QVBoxLayout(charts_group)
         charts_split = QSplitter(Qt.Horizontal)
-        charts_split.setStyleSheet("QSplitter::handle { background-color: #d2d2d7; }")
         
         # Left: Pie chart
-        pie_group = QGroupBox("Student Attendance Distribution")
-        pie_layout = QVBoxLayout(pie_group)
-        self.pie_chart = AttendanceChartWidget()
-        self.pie_chart.setMinimumSize(400, 300)
-        pie_layout.addWidget(self.pie_chart)
+        pie_group, self._pie_layout = self._build_chart_panel("Student Attendance Distribution")
         charts_split.addWidget(pie_group)
         
         # Right: Trend chart
-        trend_group = QGroupBox("Overall Attendance Trend")
-        trend_layout = QVBoxLayout(trend_group)
-        self.trend_chart = AttendanceChartWidget()
-        self.trend_chart.setMinimumSize(400, 300)
-        trend_layout.addWidget(self.trend_chart)
+        trend_group, self._trend_layout = self._build_chart_panel("Overall Attendance Trend")
         charts_split.addWidget(trend_group)
         
         charts_layout.addWidget(charts_split)
@@ -143,216 +296,220 @@ class AnalyticsWindow(QMainWindow):
         main_layout.addWidget(left_panel)
         main_layout.addWidget(right_panel)
         
-        # Apply styling
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #f5f5f7;
-            }
-            QGroupBox {
-                font-size: 18px;
-                font-weight: bold;
-                border: 2px solid #d2d2d7;
-                border-radius: 12px;
-                margin-top: 16px;
-                padding: 20px;
-                background-color: white;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 20px;
-                padding: 0 10px;
-                color: #1d1d1f;
-            }
-            QComboBox {
-                border: 2px solid #d2d2d7;
-                border-radius: 8px;
-                padding: 8px;
-                min-width: 200px;
-                background-color: white;
-                font-size: 14px;
-            }
-            QLabel {
-                font-size: 14px;
-            }
-        """)
-        
-        # Initialize data
-        self.update_analytics()
+        # Chart canvases are built on first show, see showEvent
+        self.pie_chart = None
+        self.trend_chart = None
+    
+    def showEvent(self, event):
+        """Build the chart widgets on first show and refresh the analytics"""
+        self._lazy_init()
+        super().showEvent(event)
+        self._do_update_analytics()
+    
+    def _lazy_init(self):
+        """Create the matplotlib chart widgets on first use"""
+        if self.pie_chart is not None:
+            return
+        self.pie_chart = AttendanceChartWidget()
+        self.pie_chart.setMinimumSize(400, 300)
+        self._pie_layout.addWidget(self.pie_chart)
+        
+        self.trend_chart = AttendanceChartWidget()
+        self.trend_chart.setMinimumSize(400, 300)
+        self._trend_layout.addWidget(self.trend_chart)
     
     def _create_stat_card(self, title, value, color="#1d1d1f"):
         card = QFrame()
-        card.setStyleSheet(f"""
-            QFrame {{
-                background-color: white;
-                border: 2px solid #d2d2d7;
-                border-radius: 12px;
-                padding: 15px;
-                min-width: 200px;
-                min-height: 100px;
-            }}
-            QLabel {{
-                color: {color};
-            }}
-        """)
+        card.setObjectName("statCard")
+        card.setProperty("cardColor", color)
         
         layout = QVBoxLayout(card)
         
         title_label = QLabel(title)
         title_label.setFont(QFont("SF Pro Display", 12))
-        title_label.setStyleSheet("color: #666;")
+        title_label.setObjectName("statTitle")
         
         value_label = QLabel(value)
         value_label.setFont(QFont("SF Pro Display", 24, QFont.Bold))
-        value_label.setObjectName("value_label")  # Set object name for finding later
+        value_label.setObjectName("value_label")
         
         layout.addWidget(title_label)
         layout.addWidget(value_label)
         layout.setAlignment(Qt.AlignCenter)
         
-        return card
+        return card, value_label
     
-    def update_analytics(self):
+    def update_analytics(self, *args):
+        """Schedule an analytics update, restarting the debounce window"""
+        self._update_timer.start()
+    
+    def _do_update_analytics(self):
         """Update all analytics components"""
-        from datetime import datetime, timedelta
+        if not self.isVisible():
+            return
         
         selected_date = self.calendar.selectedDate()
         period = self.period_selector.currentText()
         selected_student = self.student_selector.currentText()
+        revision = self.attendance_manager.revision
+        
+        # Nothing to redraw if the inputs and the underlying records are unchanged
+        key = (selected_date.toJulianDay(), selected_student, period, revision)
+        if key == self._last_key:
+            return
         
         # Get attendance data
-        stats = self.attendance_manager.get_attendance(selected_date.toPyDate())
+        stats = self._get_attendance(selected_date.toPyDate())
         if not stats:
             return
             
         # Update statistics cards
-        total = stats.get('total_students', 0)
-        present = stats.get('present_count', 0)
+        get = stats.get
+        total = get('total_students', 0)
+        present = get('present_count', 0)
         absent = total - present
-        percentage = (present / total * 100) if total > 0 else 0
-        
-        # Update stat cards
-        self.stat_cards["total"].findChild(QLabel, "value_label").setText(str(total))
-        self.stat_cards["present"].findChild(QLabel, "value_label").setText(str(present))
-        self.stat_cards["absent"].findChild(QLabel, "value_label").setText(str(absent))
-        self.stat_cards["percentage"].findChild(QLabel, "value_label").setText(f"{percentage:.1f}%")
+        percentage = present * 100.0 / total if total else 0.0
+        
+        # Update stat cards, repainting once for all four labels
+        labels = self.stat_value_labels
+        self.setUpdatesEnabled(False)
+        try:
+            labels["total"].setText(str(total))
+            labels["present"].setText(str(present))
+            labels["absent"].setText(str(absent))
+            labels["percentage"].setText(f"{percentage:.1f}%")
+        finally:
+            self.setUpdatesEnabled(True)
         
         # Update student selector if needed
-        current_students = set(self.student_selector.itemText(i) for i in range(self.student_selector.count()))
-        if stats.get('all_students') and set(stats['all_students']) != current_students:
-            self.student_selector.clear()
-            self.student_selector.addItems(sorted(stats['all_students']))
+        students = frozenset(stats.get('all_students') or ())
+        if students and self._update_roster(students):
+            # Signals stay blocked so repopulating does not re-enter update_analytics
+            self._set_student_items(self._sorted_students)
+            selected_student = self.student_selector.currentText()
+            key = (key[0], selected_student, period, revision)
             
+        # Charts do not depend on the selected date, so scrubbing through the
+        # calendar only refreshes the stat cards
+        chart_key = key[1:]
+        if chart_key != self._last_chart_key:
+            self._update_charts(selected_student, period)
+            self._last_chart_key = chart_key
+        
+        self._last_key = key
+    
+    def _date_range(self, period):
+        """Return the (start, end) ISO date strings covering a view period"""
+        today = date.today()
+        cache_key = (period, today.toordinal())
+        date_range = self._range_cache.get(cache_key)
+        if date_range is None:
+            days = _PERIOD_DAYS.get(period)
+            start_date = (today - timedelta(days=days)).isoformat() if days else None
+            date_range = (start_date, today.isoformat())
+            self._range_cache[cache_key] = date_range
+        return date_range
+    
+    def _update_charts(self, selected_student, period):
+        """Redraw the pie and trend charts, loading uncached data off the GUI thread"""
+        manager = self.attendance_manager
+        cache = _lookup_cache(manager)
+        stats_key = (selected_student,) + self._date_range(period) if selected_student else None
+        trend_key = (_TREND_PERIODS.get(period, "week"), date.today().isoformat())
+        self._chart_token += 1
+        request = {
+            'token': self._chart_token,
+            'revision': manager.revision,
+            'student': selected_student,
+            'period': period,
+            'stats_key': stats_key,
+            'trend_key': trend_key,
+            'student_stats': None,
+        }
+        
+        if (stats_key is None or stats_key in cache.student_stats) and trend_key in cache.trends:
+            if stats_key:
+                request['student_stats'] = cache.student_stats[stats_key]
+            request['trend_data'] = cache.trends[trend_key]
+            self._plot_charts(request)
+            return
+        
+        job = _ChartJob(manager, request)
+        job.signals.finished.connect(self._on_chart_job_finished)
+        job.signals.failed.connect(self._on_chart_job_failed)
+        QThreadPool.globalInstance().start(job)
+    
+    def _on_chart_job_finished(self, request):
+        """Cache and plot the data loaded by a _ChartJob"""
+        if request['token'] != self._chart_token:
+            return
+        # Data loaded before a record changed is still plotted but not cached
+        if request['revision'] == self.attendance_manager.revision:
+            cache = _lookup_cache(self.attendance_manager)
+            if request['stats_key']:
+                cache.student_stats[request['stats_key']] = request['student_stats']
+            cache.trends[request['trend_key']] = request['trend_data']
+        self._plot_charts(request)
+    
+    def _on_chart_job_failed(self, request, message):
+        """Blank the charts and report why a _ChartJob could not load its data"""
+        if request['token'] != self._chart_token:
+            return
+        # Leaving the old charts up would show them as the current selection
+        self.pie_chart.update_chart(None)
+        self.trend_chart.update_chart(None)
+        # Let the next selection retry instead of treating these charts as drawn
+        self._last_chart_key = None
+        self.statusBar().showMessage(f"Could not load chart data: {message}")
+    
+    def _plot_charts(self, request):
+        """Draw the pie and trend charts from loaded data"""
         # Update pie chart for selected student
-        if selected_student:
-            # Calculate date range based on period
-            end_date = datetime.now()
-            if period == "Weekly":
-                start_date = end_date - timedelta(days=7)
-            elif period == "Monthly":
-                start_date = end_date - timedelta(days=30)
-            elif period == "Semester":
-                start_date = end_date - timedelta(days=180)
-            else:
-                start_date = None
-
-            student_stats = self.attendance_manager.get_student_attendance_stats(
-                selected_student,
-                start_date.strftime('%Y-%m-%d') if start_date else None,
-                end_date.strftime('%Y-%m-%d')
+        student_stats = request['student_stats']
+        if student_stats:
+            self.pie_chart.plot_attendance_pie(
+                student_stats['days_present'],
+                student_stats['days_absent'],
+                title=f"{request['student']}'s Attendance"
             )
-            if student_stats:
-                self.pie_chart.plot_attendance_pie(
-                    student_stats['days_present'],
-                    student_stats['days_absent'],
-                    title=f"{selected_student}'s Attendance"
-                )
         
         # Update trend chart based on period
-        period_map = {
-            "Weekly": "week",
-            "Monthly": "month",
-            "Semester": "semester"
-        }
-        trend_data = self.attendance_manager.get_attendance_trend(
-            period=period_map.get(period, "week")
-        )
+        trend_data = request['trend_data']
         if trend_data:
             self.trend_chart.plot_attendance_trend(
                 trend_data['dates'],
                 trend_data['present_counts'],
-                title=f"{period} Attendance Trend"
+                title=f"{request['period']} Attendance Trend"
             )
     
     def update_student_stats(self):
         student = self.student_selector.currentText()
         if student:
-            stats = self.attendance_manager.get_student_attendance_stats(student)
+            stats = self._get_student_stats(student)
             if stats:
-                details = f"""
-                Student: {student}
-                Total Days: {stats['total_days']}
-                Days Present: {stats['days_present']}
-                Days Absent: {stats['days_absent']}
-                Attendance Rate: {stats['attendance_percentage']:.1f}%
-                """
-                self.student_stats.setText(details)
+                self.student_stats.setPlainText(_STUDENT_TEMPLATE.format_map(dict(stats, student=student)))
                 # Update student-specific charts
 
-class AnalyticsTab(QWidget):
+class AnalyticsTab(QWidget, _AnalyticsBase):
     def __init__(self, attendance_manager, parent=None):
         super().__init__(parent)
         self.attendance_manager = attendance_manager
+        self._students_cache = frozenset()
+        self._sorted_students = []
         self.setup_ui()
         
     def setup_ui(self):
+        self.setStyleSheet(_TAB_STYLESHEET)
         layout = QVBoxLayout(self)
         
         # Header
         header = QLabel("📊 Attendance Analytics")
         header.setFont(QFont("SF Pro Display", 20, QFont.Bold))
-        header.setStyleSheet("color: #0071e3; margin-bottom: 20px;")
+        header.setObjectName("tabHeader")
         layout.addWidget(header)
         
         # Calendar
-        calendar_group = QGroupBox("📅 Select Date")
-        calendar_layout = QVBoxLayout(calendar_group)
-        self.calendar = QCalendarWidget()
-        self.calendar.setGridVisible(True)
-        self.calendar.setStyleSheet("""
-            QCalendarWidget {
-                background-color: white;
-                border: 2px solid #d2d2d7;
-                border-radius: 8px;
-            }
-            QCalendarWidget QToolButton {
-                color: #1d1d1f;
-                background-color: transparent;
-                border: 2px solid transparent;
-                border-radius: 4px;
-                padding: 4px;
-            }
-            QCalendarWidget QToolButton:hover {
-                background-color: #e8e8ed;
-            }
-            QCalendarWidget QMenu {
-                background-color: white;
-                border: 1px solid #d2d2d7;
-                border-radius: 4px;
-            }
-            QCalendarWidget QSpinBox {
-                background-color: white;
-                border: 1px solid #d2d2d7;
-                border-radius: 4px;
-                padding: 3px;
-            }
-            QCalendarWidget QWidget#qt_calendar_navigationbar {
-                background-color: #f5f5f7;
-                border-top-left-radius: 8px;
-                border-top-right-radius: 8px;
-            }
-            QCalendarWidget QWidget { alternate-background-color: #fafafa; }
-        """)
-        calendar_layout.addWidget(self.calendar)
+        calendar_group = self._build_calendar_group("📅 Select Date")
         layout.addWidget(calendar_group)
         
         # Content Split
@@ -364,53 +521,15 @@ class AnalyticsTab(QWidget):
         
         self.stats_text = QTextEdit()
         self.stats_text.setReadOnly(True)
-        self.stats_text.setStyleSheet("""
-            QTextEdit {
-                background-color: white;
-                border: 2px solid #d2d2d7;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 14px;
-            }
-        """)
+        self.stats_text.setObjectName("statsText")
         stats_layout.addWidget(self.stats_text)
         
         student_layout = QHBoxLayout()
-        self.student_selector = QComboBox()
-        self.student_selector.setStyleSheet("""
-            QComboBox {
-                border: 2px solid #d2d2d7;
-                border-radius: 8px;
-                padding: 8px;
-                min-width: 200px;
-            }
-            QComboBox::drop-down {
-                border: none;
-                border-left: 2px solid #d2d2d7;
-                padding: 0 8px;
-            }
-            QComboBox::down-arrow {
-                image: url(icons/down-arrow.png);
-            }
-        """)
+        self._build_student_selector()
+        self.student_selector.setObjectName("studentSelector")
         
         self.view_student_btn = QPushButton("View Student Stats")
-        self.view_student_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #0071e3;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 8px 16px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #0077ed;
-            }
-            QPushButton:pressed {
-                background-color: #0068d1;
-            }
-        """)
+        self.view_student_btn.setObjectName("viewStudentButton")
         
         student_layout.addWidget(QLabel("Select Student:"))
         student_layout.addWidget(self.student_selector)
@@ -420,8 +539,7 @@ class AnalyticsTab(QWidget):
         content.addWidget(stats_group)
         
         # Right: Charts
-        charts_group = QGroupBox("📊 Visualizations")
-        charts_layout = QVBoxLayout(charts_group)
+        charts_group, charts_layout = self._build_chart_panel("📊 Visualizations")
         
         self.chart_widget = AttendanceChartWidget()
         charts_layout.addWidget(self.chart_widget)
@@ -433,14 +551,7 @@ class AnalyticsTab(QWidget):
             "Student History",
             "Monthly Trends"
         ])
-        self.chart_type.setStyleSheet("""
-            QComboBox {
-                border: 2px solid #d2d2d7;
-                border-radius: 8px;
-                padding: 8px;
-                min-width: 150px;
-            }
-        """)
+        self.chart_type.setObjectName("chartType")
         chart_controls.addWidget(QLabel("Chart Type:"))
         chart_controls.addWidget(self.chart_type)
         charts_layout.addLayout(chart_controls)
@@ -452,13 +563,13 @@ class AnalyticsTab(QWidget):
         layout.addWidget(content)
         
         # Connect signals
-        self.calendar.clicked.connect(self.on_date_selected)
+        self.calendar.selectionChanged.connect(self.on_date_selected)
         self.view_student_btn.clicked.connect(self.on_view_student)
         self.chart_type.currentTextChanged.connect(self.update_chart)
         
-    def on_date_selected(self, date):
+    def on_date_selected(self):
         """Handle date selection"""
-        attendance = self.attendance_manager.get_attendance(date.toPyDate())
+        attendance = self._get_attendance(self.calendar.selectedDate().toPyDate())
         if attendance:
             stats = f"""📅 Date: {attendance['date']}
 
@@ -481,19 +592,12 @@ class AnalyticsTab(QWidget):
         """Show selected student's statistics"""
         student = self.student_selector.currentText()
         if student:
-            stats = self.attendance_manager.get_student_attendance_stats(student)
+            stats = self._get_student_stats(student)
             if stats:
-                text = f"""👤 Student: {student}
-
-📊 Attendance Summary:
-• Total Days: {stats['total_days']}
-• Days Present: {stats['days_present']}
-• Days Absent: {stats['days_absent']}
-• Attendance Rate: {stats['attendance_percentage']:.1f}%"""
-                self.stats_text.setText(text)
+                self.stats_text.setPlainText(_STUDENT_TEMPLATE.format_map(dict(stats, student=student)))
                 self.update_chart("Student History")
             else:
-                self.stats_text.setText("No attendance data for selected student")
+                self.stats_text.setPlainText("No attendance data for selected student")
     
     def update_chart(self, chart_type=None):
         """Update the displayed chart"""
@@ -508,5 +612,5 @@ class AnalyticsTab(QWidget):
     
     def update_student_list(self, students):
         """Update the student selector dropdown"""
-        self.student_selector.clear()
-        self.student_selector.addItems(sorted(students))
\ No newline at end of file
+        if self._update_roster(frozenset(students)):
+            self._set_student_items(self._sorted_students)
\ No newline at end of file
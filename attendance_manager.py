@@ -1,12 +1,35 @@
 import os
-import json
-from datetime import datetime
+import orjson
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use('Qt5Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from PyQt5.QtWidgets import QVBoxLayout, QWidget
 
+# Length in days of each reporting period (both naming styles are used by callers)
+_PERIOD_DAYS = {
+    "week": 7, "weekly": 7,
+    "month": 30, "monthly": 30,
+    "semester": 180
+}
+
+_WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Numeric per-day columns of the record index built by _load_all
+_DAY_DTYPE = np.dtype([
+    ('attendance_percentage', 'f8'),
+    ('present_count', 'i4'),
+    ('total_students', 'i4')
+])
+
 class AttendanceManager:
     def __init__(self, base_dir):
         self.base_dir = base_dir
@@ -14,24 +37,63 @@ class AttendanceManager:
         self.analytics_dir = os.path.join(base_dir, 'attendance_analytics')
         os.makedirs(self.attendance_dir, exist_ok=True)
         os.makedirs(self.analytics_dir, exist_ok=True)
+        # Bumped whenever records change so cached lookups can be discarded
+        self.revision = 0
+        self._change_listeners = []
+        # In-memory index of all records, see _load_all
+        self._cache_df = None
+        self._cache_sig = None
+        # Parsed records keyed by path, with the mtime they were read at
+        self._file_records = {}
+        self._cache_lock = threading.Lock()
+
+    def add_change_listener(self, callback):
+        """Register callback(date_str) to be called when a day's records change"""
+        self._change_listeners.append(callback)
+
+    def invalidate_cache(self, date_str=None):
+        """Invalidate cached lookups after attendance records change
+
+        Args:
+            date_str (str, optional): Date that changed, 'YYYY-MM-DD'; None means all
+        """
+        self.revision += 1
+        with self._cache_lock:
+            self._cache_df = None
+            if date_str is None:
+                self._file_records.clear()
+            else:
+                self._file_records.pop(
+                    os.path.join(self.attendance_dir, f'attendance_{date_str}.json'), None)
+        for callback in self._change_listeners:
+            callback(date_str)
 
     def save_attendance(self, date, present_students, all_students):
-        """Save attendance for a specific date"""
+        """Save attendance for a specific date; the student arguments may be any iterables"""
         date_str = date.strftime('%Y-%m-%d')
         attendance_file = os.path.join(self.attendance_dir, f'attendance_{date_str}.json')
         
+        # Snapshot each argument once, so dicts, sets and generators all work
+        present_students = list(present_students)
+        present = set(present_students)
+        all_students = list(all_students)
+        
         attendance_data = {
             'date': date_str,
-            'present_students': list(present_students),
-            'all_students': list(all_students),
-            'absent_students': list(set(all_students) - set(present_students)),
+            'present_students': present_students,
+            'all_students': all_students,
+            'absent_students': [name for name in all_students if name not in present],
             'total_students': len(all_students),
-            'present_count': len(present_students),
-            'attendance_percentage': (len(present_students) / len(all_students) * 100) if all_students else 0
+            'present_count': len(present),
+            'attendance_percentage': (len(present) / len(all_students) * 100) if all_students else 0
         }
         
-        with open(attendance_file, 'w') as f:
-            json.dump(attendance_data, f, indent=4)
+        # Write to a temp file and rename so readers never see a partial record
+        tmp_file = attendance_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(attendance_data))
+        os.replace(tmp_file, attendance_file)
+        self.invalidate_cache(date_str)
 
     def get_attendance(self, date):
         """Get attendance for a specific date"""
@@ -39,14 +101,100 @@ class AttendanceManager:
         attendance_file = os.path.join(self.attendance_dir, f'attendance_{date_str}.json')
         
         if os.path.exists(attendance_file):
-            with open(attendance_file, 'r') as f:
-                return json.load(f)
+            with open(attendance_file, 'rb') as f:
+                return orjson.loads(f.read())
         return None
 
+    def _list_attendance_files(self):
+        """Return {path: mtime_ns} for every attendance file, in date order"""
+        with os.scandir(self.attendance_dir) as entries:
+            files = sorted((entry.path, entry.stat().st_mtime_ns) for entry in entries
+                           if entry.name.startswith('attendance_') and entry.name.endswith('.json'))
+        return dict(files)
+
+    @staticmethod
+    def _read_record(path):
+        """Read and parse a single attendance file"""
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+
+    def _iter_records(self, paths):
+        """Read attendance files concurrently, yielding parsed records in order"""
+        if len(paths) < 2:
+            yield from map(self._read_record, paths)
+            return
+        with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+            yield from executor.map(self._read_record, paths)
+
+    def _load_all(self):
+        """Load every attendance record into cached DataFrames
+        
+        Returns:
+            tuple: (days, student_ids, presence) - days has one row per record
+            with date, attendance_percentage, present_count and total_students,
+            sorted by date; student_ids maps each student name to a column of
+            presence, a bool matrix with one row per entry in days
+        """
+        with self._cache_lock:
+            mtimes = self._list_attendance_files()
+            paths = list(mtimes)
+            sig = (len(mtimes), max(mtimes.values(), default=0))
+            if self._cache_df is not None and sig == self._cache_sig:
+                return self._cache_df
+            
+            # Only re-read files that are new or modified since the last build
+            stale = [p for p in paths
+                     if p not in self._file_records or self._file_records[p][0] != mtimes[p]]
+            for path, attendance in zip(stale, self._iter_records(stale)):
+                self._file_records[path] = (mtimes[path], attendance)
+            for path in list(self._file_records):
+                if path not in mtimes:
+                    del self._file_records[path]
+            
+            dates = []
+            days = np.empty(len(paths), dtype=_DAY_DTYPE)
+            student_ids = {}
+            rows, cols = [], []
+            for row, path in enumerate(paths):
+                attendance = self._file_records[path][1]
+                dates.append(attendance['date'])
+                days[row] = (attendance['attendance_percentage'],
+                             attendance['present_count'],
+                             attendance['total_students'])
+                for name in attendance['present_students']:
+                    rows.append(row)
+                    cols.append(student_ids.setdefault(name, len(student_ids)))
+            
+            # Parse all dates in one vectorized pass instead of strptime per file
+            days_df = pd.DataFrame(days)
+            days_df.insert(0, 'date', pd.to_datetime(pd.Series(dates, dtype=object),
+                                                     format='%Y-%m-%d', cache=True))
+            order = np.argsort(days_df['date'].to_numpy(), kind='stable')
+            days_df = days_df.iloc[order].reset_index(drop=True)
+            
+            presence = np.zeros((len(paths), len(student_ids)), dtype=bool)
+            presence[rows, cols] = True
+            presence = presence[order]
+            
+            self._cache_df = (days_df, student_ids, presence)
+            self._cache_sig = sig
+            return self._cache_df
+
+    @staticmethod
+    def _within_period(df, period):
+        """Keep rows of a date-sorted frame dated at most one period ago
+        (all rows for an unknown period)"""
+        max_days = _PERIOD_DAYS.get(period)
+        if max_days is None:
+            return df
+        # (now - date).days <= max_days  <=>  date > now - (max_days + 1) days;
+        # rows are sorted by date so the window is a tail slice
+        cutoff = datetime.now() - timedelta(days=max_days + 1)
+        return df.iloc[df['date'].searchsorted(cutoff, side='right'):]
+
     def get_student_attendance_stats(self, student_name, start_date=None, end_date=None):
         """Get attendance statistics for a specific student"""
-        attendance_files = os.listdir(self.attendance_dir)
-        attendance_data = []
+        days, student_ids, presence = self._load_all()
         
         # Convert string dates to datetime objects if they're strings
         if isinstance(start_date, str):
@@ -54,29 +202,25 @@ class AttendanceManager:
         if isinstance(end_date, str):
             end_date = datetime.strptime(end_date, '%Y-%m-%d')
         
-        for file in attendance_files:
-            if file.startswith('attendance_') and file.endswith('.json'):
-                with open(os.path.join(self.attendance_dir, file), 'r') as f:
-                    data = json.load(f)
-                    date = datetime.strptime(data['date'], '%Y-%m-%d')
-                    
-                    if ((not start_date or date >= start_date) and 
-                        (not end_date or date <= end_date)):
-                        attendance_data.append({
-                            'date': date,
-                            'present': student_name in data['present_students']
-                        })
-        
-        df = pd.DataFrame(attendance_data)
-        if df.empty:
+        in_range = np.ones(len(days), dtype=bool)
+        if start_date:
+            in_range &= (days['date'] >= start_date).to_numpy()
+        if end_date:
+            in_range &= (days['date'] <= end_date).to_numpy()
+        
+        sid = student_ids.get(student_name)
+        present = presence[in_range, sid] if sid is not None else np.zeros(in_range.sum(), dtype=bool)
+        total = present.size
+        if not total:
             return None
-            
+        
+        days_present = int(present.sum())
         stats = {
-            'total_days': len(df),
-            'days_present': df['present'].sum(),
-            'days_absent': len(df) - df['present'].sum(),
-            'attendance_percentage': (df['present'].sum() / len(df) * 100),
-            'attendance_history': df.to_dict('records')
+            'total_days': total,
+            'days_present': days_present,
+            'days_absent': total - days_present,
+            'attendance_percentage': days_present / total * 100,
+            'attendance_history': {'date': days['date'][in_range].tolist(), 'present': present.tolist()}
         }
         return stats
 
@@ -94,83 +238,48 @@ class AttendanceManager:
         if chart_type == "distribution":
             return self._generate_distribution_chart()
             
-        # Get all attendance records
-        attendance_files = sorted([f for f in os.listdir(self.attendance_dir) 
-                                if f.startswith('attendance_') and f.endswith('.json')])
-        
-        data = []
-        for file in attendance_files:
-            with open(os.path.join(self.attendance_dir, file), 'r') as f:
-                attendance = json.load(f)
-                date = datetime.strptime(attendance['date'], '%Y-%m-%d')
-                
-                # Filter by period if specified
-                if period == "week":
-                    if (datetime.now() - date).days > 7:
-                        continue
-                elif period == "month":
-                    if (datetime.now() - date).days > 30:
-                        continue
-                elif period == "semester":
-                    if (datetime.now() - date).days > 180:
-                        continue
-                        
-                data.append({
-                    'date': date,
-                    'attendance_percentage': attendance['attendance_percentage'],
-                    'present_count': attendance['present_count'],
-                    'total_students': attendance['total_students']
-                })
-                
-        if not data:
+        # Get all attendance records, filtered by period if specified
+        days, _, _ = self._load_all()
+        df = self._within_period(days, period)
+        if df.empty:
             return None
-            
-        df = pd.DataFrame(data)
         
         # Create figure
-        fig = plt.figure(figsize=(15, 6))
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
         
         # Daily Attendance Line Plot
-        ax1 = plt.subplot(121)
-        sns.lineplot(data=df, x='date', y='attendance_percentage', marker='o')
-        plt.title('Attendance Trend')
-        plt.xticks(rotation=45)
-        plt.ylabel('Attendance %')
+        ax1.plot(df['date'].values, df['attendance_percentage'].values, marker='o')
+        ax1.set_title('Attendance Trend')
+        ax1.tick_params(axis='x', labelrotation=45)
+        ax1.set_ylabel('Attendance %')
         
         # Stats Distribution
-        ax2 = plt.subplot(122)
         if period:
             title = f"{period.capitalize()} Attendance Distribution"
         else:
             title = "Overall Attendance Distribution"
             
-        sns.histplot(data=df, x='attendance_percentage', bins=20)
-        plt.title(title)
-        plt.xlabel('Attendance %')
-        plt.ylabel('Frequency')
+        ax2.hist(df['attendance_percentage'].values, bins=20)
+        ax2.set_title(title)
+        ax2.set_xlabel('Attendance %')
+        ax2.set_ylabel('Frequency')
         
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
         
     def _generate_distribution_chart(self):
         """Generate attendance distribution charts"""
-        attendance_files = os.listdir(self.attendance_dir)
-        percentages = []
-        
-        for file in attendance_files:
-            if file.startswith('attendance_') and file.endswith('.json'):
-                with open(os.path.join(self.attendance_dir, file), 'r') as f:
-                    data = json.load(f)
-                    percentages.append(data['attendance_percentage'])
+        days, _, _ = self._load_all()
+        percentages = days['attendance_percentage'].to_numpy(dtype=float)
         
-        if not percentages:
+        if not percentages.size:
             return None
             
-        fig = plt.figure(figsize=(10, 6))
-        sns.histplot(percentages, bins=20, kde=True)
-        plt.title('Attendance Distribution')
-        plt.xlabel('Attendance Percentage')
-        plt.ylabel('Frequency')
+        fig, ax = plt.subplots(figsize=(10, 6))
+        sns.histplot(percentages, bins=20, kde=True, ax=ax)
+        ax.set_title('Attendance Distribution')
+        ax.set_xlabel('Attendance Percentage')
+        ax.set_ylabel('Frequency')
         
         return fig
 
@@ -181,108 +290,86 @@ class AttendanceManager:
             return None
 
         # Create figure with subplots
-        fig = plt.figure(figsize=(15, 5))
+        fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(15, 5))
         
         # Attendance Pie Chart
-        ax1 = plt.subplot(131)
-        plt.pie([stats['days_present'], stats['days_absent']], 
+        ax1.pie([stats['days_present'], stats['days_absent']], 
                 labels=['Present', 'Absent'],
                 colors=['#34c759', '#ff3b30'],
                 autopct='%1.1f%%')
-        plt.title(f'Attendance Distribution for {student_name}')
+        ax1.set_title(f'Attendance Distribution for {student_name}')
         
         # Attendance Timeline
-        ax2 = plt.subplot(132)
         df = pd.DataFrame(stats['attendance_history'])
-        df['present'] = df['present'].astype(int)
-        plt.plot(df['date'], df['present'], marker='o')
-        plt.title('Attendance Timeline')
-        plt.xticks(rotation=45)
-        
-        # Monthly Attendance Bar Chart
-        ax3 = plt.subplot(133)
-        df['month'] = df['date'].dt.strftime('%Y-%m')
-        monthly = df.groupby('month')['present'].mean() * 100
-        monthly.plot(kind='bar')
-        plt.title('Monthly Attendance %')
-        plt.xticks(rotation=45)
-        
-        plt.tight_layout()
+        ax2.plot(df['date'], df['present'].to_numpy(dtype=int), marker='o')
+        ax2.set_title('Attendance Timeline')
+        ax2.tick_params(axis='x', labelrotation=45)
+        
+        # Monthly Attendance Bar Chart (mean of the bool column is the present fraction)
+        months = df['date'].dt.to_period('M').astype(str)
+        monthly = df.groupby(months, sort=True)['present'].mean().mul(100)
+        monthly.plot(kind='bar', ax=ax3)
+        ax3.set_title('Monthly Attendance %')
+        ax3.tick_params(axis='x', labelrotation=45)
+        
+        fig.tight_layout()
         return fig
 
     def _generate_overall_charts(self):
         """Generate overall attendance charts"""
-        attendance_files = os.listdir(self.attendance_dir)
-        data = []
-        
-        for file in attendance_files:
-            if file.startswith('attendance_') and file.endswith('.json'):
-                with open(os.path.join(self.attendance_dir, file), 'r') as f:
-                    attendance = json.load(f)
-                    data.append({
-                        'date': datetime.strptime(attendance['date'], '%Y-%m-%d'),
-                        'attendance_percentage': attendance['attendance_percentage'],
-                        'present_count': attendance['present_count'],
-                        'total_students': attendance['total_students'],
-                        'absent_count': attendance['total_students'] - attendance['present_count']
-                    })
-        
-        if not data:
+        days, _, _ = self._load_all()
+        if days.empty:
             return None
             
-        df = pd.DataFrame(data)
-        df['weekday'] = df['date'].dt.strftime('%A')
-        df['month'] = df['date'].dt.strftime('%Y-%m')
+        df = days.copy()
+        df['absent_count'] = df['total_students'] - df['present_count']
+        df['weekday'] = pd.Categorical(df['date'].dt.day_name(), categories=_WEEKDAYS, ordered=True)
+        df['month'] = df['date'].dt.to_period('M')
         
         # Create figure with subplots
-        fig = plt.figure(figsize=(15, 10))
+        fig, ((ax1, ax2, ax3), (ax4, ax5, ax6)) = plt.subplots(2, 3, figsize=(15, 10))
         
         # Daily Attendance Percentage
-        ax1 = plt.subplot(231)
-        sns.lineplot(data=df, x='date', y='attendance_percentage', marker='o')
-        plt.title('Daily Attendance Percentage')
-        plt.xticks(rotation=45)
+        ax1.plot(df['date'].values, df['attendance_percentage'].values, marker='o')
+        ax1.set_title('Daily Attendance Percentage')
+        ax1.tick_params(axis='x', labelrotation=45)
         
         # Monthly Average Attendance
-        ax2 = plt.subplot(232)
         monthly_avg = df.groupby('month')['attendance_percentage'].mean()
-        monthly_avg.plot(kind='bar')
-        plt.title('Monthly Average Attendance')
-        plt.xticks(rotation=45)
+        monthly_avg.plot(kind='bar', ax=ax2)
+        ax2.set_title('Monthly Average Attendance')
+        ax2.tick_params(axis='x', labelrotation=45)
         
         # Attendance Distribution
-        ax3 = plt.subplot(233)
-        sns.histplot(data=df, x='attendance_percentage', bins=10, color='#0071e3')
-        plt.title('Attendance Distribution')
-        plt.xlabel('Attendance Percentage')
-        plt.ylabel('Frequency')
+        ax3.hist(df['attendance_percentage'].values, bins=10, color='#0071e3')
+        ax3.set_title('Attendance Distribution')
+        ax3.set_xlabel('Attendance Percentage')
+        ax3.set_ylabel('Frequency')
         
         # Day-wise Analysis
-        ax4 = plt.subplot(234)
-        weekday_avg = df.groupby('weekday')['attendance_percentage'].mean().reindex([
-            'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'
-        ])
-        sns.barplot(x=weekday_avg.index, y=weekday_avg.values, palette='viridis')
-        plt.title('Day-wise Average Attendance')
-        plt.xticks(rotation=45)
+        # Ordered categorical groups come out Monday-first without a reindex
+        weekday_avg = df.groupby('weekday', observed=True)['attendance_percentage'].mean()
+        ax4.bar(weekday_avg.index.astype(str), weekday_avg.values,
+                color=plt.cm.viridis(np.linspace(0, 1, len(weekday_avg))))
+        ax4.set_title('Day-wise Average Attendance')
+        ax4.tick_params(axis='x', labelrotation=45)
         
         # Present vs Absent Trend
-        ax5 = plt.subplot(235)
-        plt.stackplot(df['date'], 
+        ax5.stackplot(df['date'], 
                      [df['present_count'], df['absent_count']], 
                      labels=['Present', 'Absent'],
                      colors=['#34c759', '#ff3b30'])
-        plt.title('Present vs Absent Trend')
-        plt.legend()
-        plt.xticks(rotation=45)
+        ax5.set_title('Present vs Absent Trend')
+        ax5.legend()
+        ax5.tick_params(axis='x', labelrotation=45)
         
         # Monthly Box Plot
-        ax6 = plt.subplot(236)
-        sns.boxplot(data=df, x='month', y='attendance_percentage')
-        plt.title('Monthly Attendance Distribution')
-        plt.xticks(rotation=45)
+        # Months appear in date order, so the boxes stay chronological
+        sns.boxplot(x=df['month'].astype(str), y=df['attendance_percentage'], ax=ax6)
+        ax6.set_title('Monthly Attendance Distribution')
+        ax6.tick_params(axis='x', labelrotation=45)
         
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
 
     def clear_attendance(self, date):
@@ -292,6 +379,7 @@ class AttendanceManager:
         
         if os.path.exists(attendance_file):
             os.remove(attendance_file)
+            self.invalidate_cache(date_str)
             return True
         return False
 
@@ -304,40 +392,14 @@ class AttendanceManager:
         Returns:
             tuple: (dates, counts) - Lists of dates and corresponding attendance counts
         """
-        attendance_files = sorted([f for f in os.listdir(self.attendance_dir) 
-                                if f.startswith('attendance_') and f.endswith('.json')])
-        
-        data = []
-        for file in attendance_files:
-            with open(os.path.join(self.attendance_dir, file), 'r') as f:
-                attendance = json.load(f)
-                date = datetime.strptime(attendance['date'], '%Y-%m-%d')
-                
-                # Filter by period
-                days_diff = (datetime.now() - date).days
-                if period == "weekly" and days_diff > 7:
-                    continue
-                elif period == "monthly" and days_diff > 30:
-                    continue
-                elif period == "semester" and days_diff > 180:
-                    continue
-                    
-                data.append({
-                    'date': date,
-                    'count': attendance['present_count']
-                })
-        
-        if not data:
-            return [], []
-            
-        # Sort by date
-        data.sort(key=lambda x: x['date'])
+        days, _, _ = self._load_all()
         
-        # Split into separate lists
-        dates = [d['date'] for d in data]
-        counts = [d['count'] for d in data]
+        # Filter by period; records are already sorted by date
+        data = self._within_period(days, period)
+        if data.empty:
+            return [], []
         
-        return dates, counts
+        return data['date'].tolist(), data['present_count'].tolist()
 
     def get_attendance_trend(self, period=None):
         """Get attendance trend data over a specified period
@@ -349,38 +411,16 @@ class AttendanceManager:
             dict: Dictionary containing dates and present counts
         """
         # Get all attendance records, sorted by date
-        attendance_files = sorted([f for f in os.listdir(self.attendance_dir) 
-                                if f.startswith('attendance_') and f.endswith('.json')])
-        
-        data = []
-        for file in attendance_files:
-            with open(os.path.join(self.attendance_dir, file), 'r') as f:
-                attendance = json.load(f)
-                date = datetime.strptime(attendance['date'], '%Y-%m-%d')
-                
-                # Filter by period if specified
-                days_diff = (datetime.now() - date).days
-                if period == "week" and days_diff > 7:
-                    continue
-                elif period == "month" and days_diff > 30:
-                    continue
-                elif period == "semester" and days_diff > 180:
-                    continue
-                    
-                data.append({
-                    'date': date,
-                    'present_count': attendance['present_count']
-                })
-        
-        if not data:
+        days, _, _ = self._load_all()
+        
+        # Filter by period if specified
+        data = self._within_period(days, period)
+        if data.empty:
             return None
-            
-        # Sort by date
-        data.sort(key=lambda x: x['date'])
         
         return {
-            'dates': [d['date'] for d in data],
-            'present_counts': [d['present_count'] for d in data]
+            'dates': data['date'].tolist(),
+            'present_counts': data['present_count'].tolist()
         }
 
 class AttendanceChartWidget(QWidget):
@@ -388,34 +428,92 @@ class AttendanceChartWidget(QWidget):
         super().__init__(parent)
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
+        # One canvas for the widget's lifetime; update_chart swaps figures into it
+        self._blank_figure = Figure()
+        self._canvas = FigureCanvas(self._blank_figure)
+        self.layout.addWidget(self._canvas)
+        # Persistent artists reused by plot_attendance_pie/plot_attendance_trend
+        self._pie = None
+        self._trend = None
         
     def update_chart(self, figure):
         """Update the chart display"""
-        # Clear previous widgets
-        for i in reversed(range(self.layout.count())): 
-            self.layout.itemAt(i).widget().setParent(None)
-            
-        if figure:
-            canvas = FigureCanvas(figure)
-            self.layout.addWidget(canvas)
+        old_figure = self._canvas.figure
+        if figure is None:
+            self._blank_figure.clear()
+            figure = self._blank_figure
+        self._pie = None
+        self._trend = None
+        
+        # Swap the figure into the existing canvas instead of rebuilding the widget
+        self._canvas.setUpdatesEnabled(False)
+        self._canvas.figure = figure
+        figure.set_canvas(self._canvas)
+        # Scale the dpi by the screen's pixel ratio, as the canvas does for its own figure,
+        # so text and line widths keep their size on HiDPI screens
+        original_dpi = getattr(figure, '_original_dpi', figure.dpi)
+        figure._set_dpi(self._canvas.device_pixel_ratio * original_dpi, forward=False)
+        figure.set_size_inches(self._canvas.width() / original_dpi,
+                               self._canvas.height() / original_dpi,
+                               forward=False)
+        self._canvas.setUpdatesEnabled(True)
+        self._canvas.draw_idle()
+        
+        # Release the figure that was being shown
+        if old_figure is not figure and old_figure is not self._blank_figure:
+            plt.close(old_figure)
             
     def plot_attendance_pie(self, days_present, days_absent, title="Attendance Distribution"):
         """Plot a pie chart showing attendance distribution"""
-        fig, ax = plt.subplots(figsize=(8, 6))
-        plt.pie([days_present, days_absent],
-                labels=['Present', 'Absent'],
-                colors=['#34c759', '#ff3b30'],
-                autopct='%1.1f%%')
-        plt.title(title)
-        self.update_chart(fig)
+        if self._pie is None:
+            fig, ax = plt.subplots(figsize=(8, 6))
+            wedges, labels, autotexts = ax.pie([days_present, days_absent],
+                    labels=['Present', 'Absent'],
+                    colors=['#34c759', '#ff3b30'],
+                    autopct='%1.1f%%')
+            ax.set_title(title)
+            self.update_chart(fig)
+            self._pie = (ax, wedges, labels, autotexts)
+            return
+        
+        # Move the existing wedges and their labels instead of rebuilding the figure
+        ax, wedges, labels, autotexts = self._pie
+        values = (days_present, days_absent)
+        total = float(sum(values))
+        theta1 = 0.0
+        for wedge, label, autotext, value in zip(wedges, labels, autotexts, values):
+            fraction = value / total if total else 0.0
+            theta2 = theta1 + 360.0 * fraction
+            wedge.set_theta1(theta1)
+            wedge.set_theta2(theta2)
+            angle = math.radians((theta1 + theta2) / 2)
+            x, y = math.cos(angle), math.sin(angle)
+            label.set_position((1.1 * x, 1.1 * y))
+            label.set_horizontalalignment('left' if x > 0 else 'right')
+            autotext.set_position((0.6 * x, 0.6 * y))
+            autotext.set_text('%1.1f%%' % (fraction * 100))
+            theta1 = theta2
+        ax.set_title(title)
+        self._canvas.draw_idle()
         
     def plot_attendance_trend(self, dates, counts, title="Attendance Trend"):
         """Plot a line chart showing attendance trend"""
-        fig, ax = plt.subplots(figsize=(8, 6))
-        plt.plot(dates, counts, marker='o')
-        plt.title(title)
-        plt.xticks(rotation=45)
-        plt.ylabel('Present Count')
-        plt.grid(True)
-        plt.tight_layout()
-        self.update_chart(fig)
+        if self._trend is None:
+            fig, ax = plt.subplots(figsize=(8, 6))
+            line, = ax.plot(dates, counts, marker='o')
+            ax.set_title(title)
+            ax.tick_params(axis='x', labelrotation=45)
+            ax.set_ylabel('Present Count')
+            ax.grid(True)
+            fig.tight_layout()
+            self.update_chart(fig)
+            self._trend = (ax, line)
+            return
+        
+        # Swap the line data in place and rescale
+        ax, line = self._trend
+        line.set_data(dates, counts)
+        ax.relim()
+        ax.autoscale_view()
+        ax.set_title(title)
+        self._canvas.draw_idle()
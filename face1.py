@@ -1,13 +1,23 @@
 import sys
+import re
+import os
+# Every array op here is small; keep BLAS/OpenMP from spinning up thread teams for each
+# one. Must be set before numpy and cv2 load their runtimes
+os.environ.setdefault("OMP_NUM_THREADS", "1")
 import cv2
 import face_recognition
+import face_recognition.api as face_api
+import dlib
 import numpy as np
-import os
 import pickle
 import shutil
 import json
+import bisect
 from datetime import datetime
+from collections import Counter
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -20,24 +30,114 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout
                             QStatusBar, QTabWidget, QGroupBox, QFormLayout, QComboBox,
                             QListWidget, QListWidgetItem, QSplitter, QTextEdit, QCheckBox,
                             QProgressBar, QDialog, QDialogButtonBox, QScrollArea, QSizePolicy,
-                            QCalendarWidget)
-from PyQt5.QtGui import QImage, QPixmap, QFont, QIcon, QColor, QPalette
-from PyQt5.QtCore import Qt, QTimer, pyqtSlot, QThread, pyqtSignal, QDate
+                            QCalendarWidget, QListView)
+from PyQt5.QtGui import QImage, QPixmap, QFont, QIcon, QColor, QPalette, QPainter, QPen
+from PyQt5.QtCore import (Qt, QTimer, pyqtSlot, QThread, pyqtSignal, QDate,
+                          QSortFilterProxyModel, QObject, QRunnable,
+                          QThreadPool, QRegularExpression, QAbstractListModel, QModelIndex, QRect)
 from attendance_manager import AttendanceManager, AttendanceChartWidget
 
+# Display-side OpenCV calls are on small frames, where serial beats the fork/join overhead
+cv2.setNumThreads(1)
+
+# Student image names look like 'StudentName_1.jpg'; the name is everything before the last underscore
+_IMAGE_NAME_RE = re.compile(r'^(.+)_[^_]+\.(?:jpe?g|png)$', re.IGNORECASE)
+# QImage.Format_BGR888 was added in Qt 5.14
+_QIMAGE_HAS_BGR888 = hasattr(QImage, 'Format_BGR888')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+# face_recognition keeps one module-level dlib detector, shape predictor and encoder, which
+# dlib doesn't support calling from several threads at once; every thread using them holds this
+_DLIB_LOCK = threading.Lock()
+
+def aligned_empty(shape, dtype=np.float32, align=64):
+    """np.empty whose data starts on an align-byte boundary"""
+    nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    buf = np.empty(nbytes + align, dtype=np.uint8)
+    offset = -buf.ctypes.data % align
+    return buf[offset:offset + nbytes].view(dtype).reshape(shape)
+
+def read_encoding_file(encoding_file, names_only=False):
+    """Read (encodings, names) from an encodings file; encodings is None if names_only"""
+    if encoding_file.endswith('.npz'):
+        # Members are read on access, so listing names never touches the encodings
+        with np.load(encoding_file) as data:
+            names = data['names'].tolist()
+            encodings = None if names_only else data['encodings']
+        return encodings, names
+    
+    # Older datasets pickle a list of float64 arrays (or a float16 matrix)
+    with open(encoding_file, 'rb') as f:
+        data = pickle.load(f)
+    return (None if names_only else data['encodings']), list(data.get('names', []))
+
 
 # Thread class for face recognition to prevent GUI freezing
 class FaceRecognitionThread(QThread):
-    update_frame = pyqtSignal(np.ndarray, list, list, list)
+    # Emitted when take_frame has a new display image; never queued more than once
+    frame_ready = pyqtSignal()
     update_attendance = pyqtSignal(str, str)
     
-    def __init__(self, known_face_encodings, known_face_names, threshold=0.45):
+    # Frame scheduling: detect on every Nth frame, re-encode on every Mth
+    DETECT_EVERY = 2
+    ENCODE_EVERY = 5
+    # A pixel counts as moved when its gray level changes by more than this
+    MOTION_THRESHOLD = 15
+    # Fraction of moved pixels below which the scene is treated as static
+    MOTION_MIN_FRACTION = 0.01
+    # Minimum seconds between attendance signals for the same student
+    ATTENDANCE_EMIT_INTERVAL = 10.0
+    # Known faces needed before matching on the GPU pays for the per-frame transfers
+    GPU_MIN_GALLERY = 1000
+    
+    def __init__(self, known_face_encodings, known_face_names, threshold=0.45, detection_model=None,
+                 display_size=None):
         super().__init__()
-        self.known_face_encodings = known_face_encodings
+        # One contiguous, cache-line aligned (N, 128) matrix so all faces in a frame are matched in one pass
+        encodings = np.asarray(known_face_encodings, dtype=np.float32).reshape(-1, 128)
+        self.known_face_encodings = aligned_empty(encodings.shape, np.float32)
+        self.known_face_encodings[...] = encodings
+        self.known_sq_norms = np.einsum('ij,ij->i', self.known_face_encodings, self.known_face_encodings)
+        # Very large galleries stay resident on the GPU when CuPy is installed
+        self._cupy = None
+        if len(self.known_face_encodings) >= self.GPU_MIN_GALLERY:
+            try:
+                import cupy
+                self._gpu_encodings = cupy.asarray(self.known_face_encodings)
+                self._gpu_sq_norms = cupy.asarray(self.known_sq_norms)
+                self._cupy = cupy
+            except Exception as e:  # Not installed, or no usable CUDA device
+                print(f"GPU matching unavailable, using CPU: {e}")
         self.known_face_names = known_face_names
         self.threshold = threshold
+        # The CNN detector is more accurate but only fast enough on a CUDA build of dlib
+        if detection_model is None:
+            detection_model = "cnn" if getattr(dlib, "DLIB_USE_CUDA", False) else "hog"
+        self.detection_model = detection_model
+        # (width, height) to fit emitted frames into, so the GUI never rescales them
+        self.display_size = display_size
         self.running = False
         self.video_capture = None
+        # Single-slot hand-off of display images to the GUI thread
+        self._display_lock = threading.Lock()
+        self._pending_image = None
+        # Single-slot hand-off from the capture thread
+        self._reader = None
+        self._frame_lock = threading.Lock()
+        self._latest_frame = None
+        # Results of the last detection, reused on skipped frames
+        self.frame_index = 0
+        self.prev_gray = None
+        self.last_locations = []
+        self.last_names = []
+        # Monotonic time each student was last reported to the GUI
+        self._last_emitted = {}
+        # Scratch buffers for the downscaled frame, allocated on the first frame
+        self._small = None
+        self._gray = None
+        self._rgb = None
+        # Display-size frame and its RGB copy for Qt builds without Format_BGR888
+        self._display_frame = None
+        self._display_rgb = None
         
     def run(self):
         try:
@@ -47,48 +147,83 @@ class FaceRecognitionThread(QThread):
             if not self.video_capture.isOpened():
                 print("Error: Could not open camera")
                 return
+            
+            # Ask the driver for compressed 640x480 frames and a one-frame queue
+            # so each read returns the newest frame instead of a stale one
+            self.video_capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+            self.video_capture.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+            self.video_capture.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+            self.video_capture.set(cv2.CAP_PROP_FPS, 30)
+            self.video_capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            
+            # Grab frames on their own thread so slow recognition never lets the camera queue up
+            self._reader = threading.Thread(target=self._read_frames, args=(self.video_capture,), daemon=True)
+            self._reader.start()
                 
             while self.running:
-                ret, frame = self.video_capture.read()
-                if not ret:
-                    print("Error: Could not read frame")
+                # Always work on the newest frame, dropping any we were too slow for
+                with self._frame_lock:
+                    frame, self._latest_frame = self._latest_frame, None
+                if frame is None:
+                    time.sleep(0.005)
                     continue
                     
                 try:
-                    # Process at smaller scale for performance
-                    small_frame = cv2.resize(frame, (0, 0), fx=0.5, fy=0.5)
-                    rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+                    # Process at smaller scale for performance, into buffers reused across frames
+                    self._ensure_buffers(frame)
+                    small_frame = cv2.resize(frame, (self._small.shape[1], self._small.shape[0]), dst=self._small)
                     
-                    # Find faces
-                    face_locations = face_recognition.face_locations(rgb_small_frame)
-                    face_encodings = face_recognition.face_encodings(rgb_small_frame, face_locations)
+                    gray_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+                    self.frame_index += 1
                     
-                    # Scale face locations back to original size
-                    face_locations_original = [(top * 2, right * 2, bottom * 2, left * 2) 
-                                           for top, right, bottom, left in face_locations]
+                    # Static scene or off-schedule frame: redraw the last results
+                    if not self._should_detect(gray_small_frame):
+                        self._publish(self._annotate(frame, self.last_locations, self.last_names))
+                        continue
+                    
+                    # Find faces; the HOG detector only needs luminance, the CNN one wants colour
+                    rgb_small_frame = None
+                    if self.detection_model == "cnn":
+                        rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+                        with _DLIB_LOCK:
+                            face_locations = face_recognition.face_locations(rgb_small_frame, model="cnn")
+                    else:
+                        with _DLIB_LOCK:
+                            face_locations = face_recognition.face_locations(gray_small_frame)
                     
-                    recognized_names = []
+                    # Scale face locations back to original size
+                    face_locations_original = (np.asarray(face_locations, dtype=np.int32).reshape(-1, 4) * 2).tolist()
                     
-                    for face_encoding in face_encodings:
-                        name = "Unknown"
-                        if len(self.known_face_encodings) > 0:
-                            face_distances = face_recognition.face_distance(
-                                self.known_face_encodings, face_encoding
-                            )
-                            best_match_index = np.argmin(face_distances)
-                            
-                            if face_distances[best_match_index] < self.threshold:
-                                name = self.known_face_names[best_match_index]
-                                # Signal to update attendance
+                    if (self.frame_index % self.ENCODE_EVERY == 0 or
+                            len(face_locations) != len(self.last_locations)):
+                        # The encoder needs colour, so only convert when there is a face to encode
+                        face_encodings = []
+                        if face_locations:
+                            if rgb_small_frame is None:
+                                rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+                            face_encodings = self._encode_faces(rgb_small_frame, face_locations)
+                        
+                        recognized_names = self.match_faces(face_encodings)
+                        
+                        # Signal to update attendance, at most once per interval per student
+                        now = time.monotonic()
+                        for name in recognized_names:
+                            last = self._last_emitted.get(name)
+                            if name != "Unknown" and (last is None or now - last >= self.ATTENDANCE_EMIT_INTERVAL):
+                                self._last_emitted[name] = now
                                 self.update_attendance.emit(
                                     name, 
                                     datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                                 )
-                        
-                        recognized_names.append(name)
+                    else:
+                        # Same faces as last time; carry names over to the moved boxes
+                        recognized_names = self._track_names(face_locations_original)
+                    
+                    self.last_locations = face_locations_original
+                    self.last_names = recognized_names
                     
                     # Update the frame
-                    self.update_frame.emit(frame, face_locations_original, recognized_names, face_encodings)
+                    self._publish(self._annotate(frame, face_locations_original, recognized_names))
                     
                 except Exception as e:
                     print(f"Error processing frame: {e}")
@@ -99,6 +234,184 @@ class FaceRecognitionThread(QThread):
         finally:
             self.cleanup()
     
+    def _publish(self, image):
+        """Replace the pending display image, signalling only if the GUI had taken the last one"""
+        with self._display_lock:
+            signal = self._pending_image is None
+            self._pending_image = image
+        if signal:
+            self.frame_ready.emit()
+    
+    def take_frame(self):
+        """Return the newest display image (or None) and empty the slot"""
+        with self._display_lock:
+            image, self._pending_image = self._pending_image, None
+        return image
+    
+    def _annotate(self, frame, face_locations, names):
+        """Fit the frame to the display and paint face boxes and names over it"""
+        display = self._fit_to_display(frame)
+        image = self._to_qimage(display)
+        if not face_locations:
+            return image
+        
+        # Paint at display resolution, so only the pixels actually shown are touched;
+        # QPainter on a QImage is safe outside the GUI thread
+        scale = display.shape[1] / frame.shape[1]
+        boxes = np.rint(np.asarray(face_locations, dtype=np.float32).reshape(-1, 4) * scale).astype(np.int32).tolist()
+        label_height = max(14, round(35 * scale))
+        font = QFont("Arial")
+        font.setPixelSize(max(10, round(16 * scale)))
+        
+        painter = QPainter(image)
+        try:
+            painter.setFont(font)
+            for (top, right, bottom, left), name in zip(boxes, names):
+                # Green for known, red for unknown
+                color = QColor(0, 255, 0) if name != "Unknown" else QColor(255, 0, 0)
+                
+                # Box around the face, then a filled label bar along its bottom edge
+                painter.setPen(QPen(color, 2))
+                painter.drawRect(left, top, right - left, bottom - top)
+                painter.fillRect(left, bottom - label_height, right - left, label_height, color)
+                
+                painter.setPen(QColor(255, 255, 255))
+                painter.drawText(QRect(left + 6, bottom - label_height, right - left - 6, label_height),
+                                 Qt.AlignLeft | Qt.AlignVCenter, name)
+        finally:
+            painter.end()
+        return image
+    
+    def _to_qimage(self, frame):
+        """Wrap a BGR frame as a QImage that owns its pixels"""
+        # Qt 5.14+ reads BGR directly; copy so the image owns its pixels once the frame is gone
+        h, w = frame.shape[:2]
+        if _QIMAGE_HAS_BGR888:
+            return QImage(frame.data, w, h, frame.strides[0], QImage.Format_BGR888).copy()
+        
+        # Older Qt: swap channels into a buffer reused across frames
+        if self._display_rgb is None or self._display_rgb.shape != frame.shape:
+            self._display_rgb = np.empty_like(frame)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._display_rgb)
+        return QImage(self._display_rgb.data, w, h, self._display_rgb.strides[0], QImage.Format_RGB888).copy()
+    
+    def _fit_to_display(self, frame):
+        """Downscale the frame to fit display_size, keeping its aspect ratio"""
+        if self.display_size is None:
+            return frame
+        h, w = frame.shape[:2]
+        scale = min(self.display_size[0] / w, self.display_size[1] / h)
+        size = (max(1, int(w * scale)), max(1, int(h * scale)))
+        if size == (w, h):
+            return frame
+        
+        if self._display_frame is None or self._display_frame.shape[1::-1] != size:
+            self._display_frame = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        # INTER_AREA averages pixels, so the one resize here looks as good as a smooth scale
+        return cv2.resize(frame, size, dst=self._display_frame, interpolation=cv2.INTER_AREA)
+    
+    @staticmethod
+    def _encode_faces(rgb_frame, face_locations):
+        """Encode all faces in a frame with one batched dlib descriptor call"""
+        shapes = dlib.full_object_detections()
+        with _DLIB_LOCK:
+            for top, right, bottom, left in face_locations:
+                shapes.append(face_api.pose_predictor_5_point(rgb_frame, dlib.rectangle(left, top, right, bottom)))
+            # Same model and jitter count as face_recognition.face_encodings; runs on the
+            # GPU automatically when dlib is built with CUDA
+            descriptors = face_api.face_encoder.compute_face_descriptor(rgb_frame, shapes, 1)
+        return [np.array(descriptor) for descriptor in descriptors]
+    
+    def _ensure_buffers(self, frame):
+        """(Re)allocate the half-size scratch buffers when the frame size changes"""
+        h, w = frame.shape[:2]
+        if self._small is not None and self._small.shape[:2] == (h // 2, w // 2):
+            return
+        self._small = np.empty((h // 2, w // 2, 3), dtype=np.uint8)
+        self._gray = np.empty((h // 2, w // 2), dtype=np.uint8)
+        self._rgb = np.empty_like(self._small)
+        self.prev_gray = None
+    
+    def _should_detect(self, gray_frame):
+        """Decide whether to run detection on this frame"""
+        if self.prev_gray is not None:
+            # Skip when little has changed since the last detected frame
+            moved = np.count_nonzero(cv2.absdiff(gray_frame, self.prev_gray) > self.MOTION_THRESHOLD)
+            if moved < self.MOTION_MIN_FRACTION * gray_frame.size:
+                return False
+            if self.frame_index % self.DETECT_EVERY:
+                return False
+        if self.prev_gray is None:
+            self.prev_gray = gray_frame.copy()
+        else:
+            np.copyto(self.prev_gray, gray_frame)
+        return True
+    
+    def _track_names(self, face_locations):
+        """Give each new box the name of the nearest box from the last detection"""
+        if not self.last_locations:
+            return ["Unknown"] * len(face_locations)
+        
+        last_centres = np.array([((l + r) / 2, (t + b) / 2) for t, r, b, l in self.last_locations])
+        names = []
+        for top, right, bottom, left in face_locations:
+            centre = np.array(((left + right) / 2, (top + bottom) / 2))
+            nearest = np.argmin(((last_centres - centre) ** 2).sum(axis=1))
+            names.append(self.last_names[nearest])
+        return names
+    
+    def match_faces(self, face_encodings):
+        """Return the best matching known name (or "Unknown") for each encoding"""
+        if not face_encodings:
+            return []
+        if len(self.known_face_encodings) == 0:
+            return ["Unknown"] * len(face_encodings)
+        
+        # (M, N) distances between every detected face and every known face, using
+        # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b so the bulk of the work is one matrix product
+        encodings = np.asarray(face_encodings, dtype=np.float32)
+        if self._cupy is not None:
+            best_match_indices, best_sq_distances = self._nearest_gpu(encodings)
+        else:
+            sq_distances = (np.einsum('ij,ij->i', encodings, encodings)[:, None]
+                            + self.known_sq_norms[None, :]
+                            - 2.0 * (encodings @ self.known_face_encodings.T))
+            # The nearest face by squared distance is the nearest by distance, so compare
+            # against threshold^2 and skip the square root over the whole matrix
+            best_match_indices = sq_distances.argmin(axis=1)
+            best_sq_distances = sq_distances[np.arange(len(encodings)), best_match_indices]
+        matched = best_sq_distances < self.threshold * self.threshold
+        
+        return [self.known_face_names[index] if is_match else "Unknown"
+                for index, is_match in zip(best_match_indices.tolist(), matched.tolist())]
+    
+    def _nearest_gpu(self, encodings):
+        """match_faces' nearest-neighbour step on the GPU; returns (indices, squared distances) on the host"""
+        cp = self._cupy
+        probes = cp.asarray(encodings)
+        sq_distances = (cp.einsum('ij,ij->i', probes, probes)[:, None]
+                        + self._gpu_sq_norms[None, :]
+                        - 2.0 * (probes @ self._gpu_encodings.T))
+        best_match_indices = sq_distances.argmin(axis=1)
+        best_sq_distances = sq_distances[cp.arange(len(encodings)), best_match_indices]
+        # Only the per-face results come back over PCIe
+        return cp.asnumpy(best_match_indices), cp.asnumpy(best_sq_distances)
+    
+    def _read_frames(self, video_capture):
+        """Capture loop; keeps only the most recent frame for the recognition loop"""
+        try:
+            while self.running:
+                ret, frame = video_capture.read()
+                if not ret:
+                    print("Error: Could not read frame")
+                    time.sleep(0.01)
+                    continue
+                with self._frame_lock:
+                    self._latest_frame = frame
+        finally:
+            # Releasing here means the capture is never released under a read() in progress
+            video_capture.release()
+    
     def stop(self):
         self.running = False
         self.cleanup()
@@ -106,6 +419,15 @@ class FaceRecognitionThread(QThread):
     
     def cleanup(self):
         """Clean up camera resources"""
+        self.running = False
+        reader = self._reader
+        if reader is not None and reader is not threading.current_thread():
+            reader.join(timeout=1.0)
+            if reader.is_alive():
+                # Still blocked in read(); the reader releases the capture once that returns
+                self.video_capture = None
+                return
+            self._reader = None
         if self.video_capture is not None:
             self.video_capture.release()
             self.video_capture = None
@@ -116,52 +438,269 @@ class LoadStudentsThread(QThread):
     finished = pyqtSignal(list, list, int)
     progress = pyqtSignal(str)
     
-    def __init__(self, directory):
+    # Per-image encodings in cache_dir: a matrix of encodings plus a JSON index into it.
+    # Nothing is unpickled and nothing is written into the user's image folder
+    CACHE_DATA = "image_cache.npz"
+    CACHE_INDEX = "image_cache.json"
+    
+    def __init__(self, directory, cache_dir):
         super().__init__()
-        self.directory = directory
+        self.directory = os.path.abspath(directory)
+        self.cache_dir = cache_dir
         
+    def _process_image(self, entry, cache):
+        """Encode one image (an os.DirEntry), returning ((path, mtime_ns, size), encoding or None)
+        
+        Returns (None, None) if the image could not be read.
+        """
+        filename = entry.name
+        try:
+            img_path = entry.path
+            
+            self.progress.emit(f"Processing image: {filename}")
+            
+            stat = entry.stat()
+            key = (img_path, stat.st_mtime_ns, stat.st_size)
+            if key in cache:
+                return key, cache[key]
+            
+            # Use OpenCV first (faster loading)
+            img = cv2.imread(img_path)
+            if img is None:
+                self.progress.emit(f"Couldn't read image: {filename}")
+                return None, None
+                
+            # Convert for face_recognition
+            rgb_img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+            # Only decoding runs in parallel; the dlib models are shared, see _DLIB_LOCK
+            with _DLIB_LOCK:
+                encodings = face_recognition.face_encodings(rgb_img)
+            if encodings:
+                self.progress.emit(f"Successfully processed {filename}")
+            return key, (encodings[0] if encodings else None)
+        except Exception as e:
+            self.progress.emit(f"Error processing {filename}: {str(e)}")
+            return None, None
+    
     def run(self):
-        known_face_encodings = []
-        known_face_names = []
-        students_encodings = {}
+        # One row per usable image, tagged with the index of its student
+        all_encodings = []
+        student_ids = []
+        students_index = {}
         loaded_count = 0
         
         self.progress.emit("Starting to load student images...")
         
-        for filename in os.listdir(self.directory):
-            if filename.endswith(".jpg") or filename.endswith(".png"):
-                try:
-                    name = "_".join(filename.split("_")[:-1])  # Extract student name before underscore number
-                    img_path = os.path.join(self.directory, filename)
-                    
-                    self.progress.emit(f"Processing image: {filename}")
-                    
-                    # Use OpenCV first (faster loading)
-                    img = cv2.imread(img_path)
-                    if img is None:
-                        self.progress.emit(f"Couldn't read image: {filename}")
-                        continue
-                        
-                    # Convert for face_recognition
-                    rgb_img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                    encodings = face_recognition.face_encodings(rgb_img)
-                    
-                    if encodings:  # Ensure at least one encoding exists
-                        if name in students_encodings:
-                            students_encodings[name].append(encodings[0])
-                        else:
-                            students_encodings[name] = [encodings[0]]
-                        loaded_count += 1
-                        self.progress.emit(f"Successfully processed {name}")
-                except Exception as e:
-                    self.progress.emit(f"Error processing {filename}: {str(e)}")
+        # Encodings from earlier runs, keyed by (path, mtime_ns, size); None marks an image with no face
+        try:
+            cache = self._load_cache()
+        except Exception as e:
+            self.progress.emit(f"Ignoring unreadable encoding cache: {str(e)}")
+            cache = {}
+        new_cache = {}
+        
+        # Decode images in parallel; the dlib encoding step is serialised in _process_image
+        entries = []
+        names = []
+        with os.scandir(self.directory) as it:
+            for e in it:
+                match = _IMAGE_NAME_RE.match(e.name)
+                if match and e.is_file():
+                    entries.append(e)
+                    names.append(match.group(1))
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results = list(executor.map(lambda e: self._process_image(e, cache), entries))
+        
+        # Merge serially so students keep directory order
+        for name, (key, encoding) in zip(names, results):
+            if key is None:
+                continue
+            new_cache[key] = encoding
+            if encoding is not None:  # Ensure at least one encoding exists
+                student_ids.append(students_index.setdefault(name, len(students_index)))
+                all_encodings.append(encoding)
+                loaded_count += 1
+        
+        # Of this folder's entries, only keep those for images that still exist
+        new_cache.update((key, encoding) for key, encoding in cache.items()
+                         if os.path.dirname(key[0]) != self.directory)
+        try:
+            self._save_cache(new_cache)
+        except Exception as e:
+            self.progress.emit(f"Couldn't save encoding cache: {str(e)}")
         
-        # Average encodings for each student
-        for name, encodings in students_encodings.items():
-            known_face_encodings.append(np.mean(encodings, axis=0))
-            known_face_names.append(name)
+        # Average encodings for each student in a single scatter-add over all rows. Images are
+        # grouped by name alone, so two students who share a name become one averaged row
+        known_face_encodings = []
+        known_face_names = list(students_index)
+        if all_encodings:
+            sums = np.zeros((len(students_index), len(all_encodings[0])))
+            np.add.at(sums, student_ids, all_encodings)
+            counts = np.bincount(student_ids, minlength=len(students_index))
+            known_face_encodings = list(sums / counts[:, None])
             
         self.finished.emit(known_face_encodings, known_face_names, loaded_count)
+    
+    def _load_cache(self):
+        """Read the encoding cache as {(path, mtime_ns, size): encoding or None}"""
+        index_path = os.path.join(self.cache_dir, self.CACHE_INDEX)
+        if not os.path.exists(index_path):
+            return {}
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+        with np.load(os.path.join(self.cache_dir, self.CACHE_DATA), allow_pickle=False) as data:
+            # Both files carry the same token, so a half-finished save is never mixed with the other
+            if str(data['token']) != index['token']:
+                raise ValueError("encoding cache index and data don't match")
+            encodings = data['encodings']
+        return {(path, mtime_ns, size): (encodings[row] if row >= 0 else None)
+                for path, mtime_ns, size, row in index['entries']}
+    
+    def _save_cache(self, cache):
+        """Write the encoding cache; row -1 in the index marks an image with no face"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entries = []
+        encodings = []
+        for (path, mtime_ns, size), encoding in cache.items():
+            row = -1
+            if encoding is not None:
+                row = len(encodings)
+                encodings.append(encoding)
+            entries.append([path, mtime_ns, size, row])
+        token = os.urandom(8).hex()
+        
+        # Data first, then the index that points into it; each swapped in whole
+        data_path = os.path.join(self.cache_dir, self.CACHE_DATA)
+        with open(data_path + '.tmp', 'wb') as f:
+            np.savez(f, token=np.array(token),
+                     encodings=np.asarray(encodings, dtype=np.float64).reshape(-1, 128))
+        os.replace(data_path + '.tmp', data_path)
+        index_path = os.path.join(self.cache_dir, self.CACHE_INDEX)
+        with open(index_path + '.tmp', 'w') as f:
+            json.dump({'token': token, 'entries': entries}, f)
+        os.replace(index_path + '.tmp', index_path)
+
+
+# Thread class for checking camera availability without blocking the GUI
+class CameraProbeThread(QThread):
+    finished = pyqtSignal(bool)
+    
+    def run(self):
+        available = False
+        try:
+            video_capture = cv2.VideoCapture(0)
+            available = video_capture.isOpened()
+            video_capture.release()
+        except Exception as e:
+            print(f"Camera probe error: {e}")
+        self.finished.emit(available)
+
+
+# Thread class for reading a saved encoding dataset without blocking the GUI
+class LoadEncodingSetThread(QThread):
+    finished = pyqtSignal(object, list)
+    failed = pyqtSignal(str)
+    
+    def __init__(self, encoding_file):
+        super().__init__()
+        self.encoding_file = encoding_file
+        
+    def run(self):
+        try:
+            encodings, names = read_encoding_file(self.encoding_file)
+            encodings = np.ascontiguousarray(encodings, dtype=np.float32).reshape(-1, 128)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(encodings, names)
+
+
+class StudentNamesJobSignals(QObject):
+    finished = pyqtSignal(str, object, str)
+
+
+class StudentNamesJob(QRunnable):
+    """Read the student names of one dataset on the global thread pool"""
+    
+    def __init__(self, dataset_path, encoding_file):
+        super().__init__()
+        self.dataset_path = dataset_path
+        self.encoding_file = encoding_file
+        self.signals = StudentNamesJobSignals()
+        
+    def run(self):
+        try:
+            _, names = read_encoding_file(self.encoding_file, names_only=True)
+        except Exception as e:
+            self.signals.finished.emit(self.dataset_path, None, str(e))
+            return
+        self.signals.finished.emit(self.dataset_path, names, "")
+
+
+# Thread class for sending the attendance email without blocking the GUI
+class EmailSendThread(QThread):
+    sent = pyqtSignal()
+    failed = pyqtSignal(str, str)
+    
+    def __init__(self, send_message, msg, parent=None):
+        super().__init__(parent)
+        self.send_message = send_message
+        self.msg = msg
+        
+    def run(self):
+        try:
+            self.send_message(self.msg)
+        except smtplib.SMTPAuthenticationError:
+            self.failed.emit("Authentication Error",
+                "Failed to authenticate with email server. Please check your email and app password.")
+        except smtplib.SMTPException as e:
+            self.failed.emit("SMTP Error", f"An error occurred while sending email: {str(e)}")
+        except TimeoutError:
+            self.failed.emit("Timeout Error",
+                "Connection to email server timed out. Please check your internet connection.")
+        except Exception as e:
+            self.failed.emit("Error", f"Failed to send email: {str(e)}")
+        else:
+            self.sent.emit()
+
+
+# List model for the students in a dataset; rows are formatted only when the view asks for them
+class StudentsModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pairs = []
+        self._message = None
+        
+    def setPairs(self, pairs):
+        """Show (name, encoding count) pairs"""
+        self.beginResetModel()
+        self._pairs = list(pairs)
+        self._message = None
+        self.endResetModel()
+        
+    def setMessage(self, message):
+        """Show a single status row instead of students, or nothing if message is None"""
+        self.beginResetModel()
+        self._pairs = []
+        self._message = message
+        self.endResetModel()
+        
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return 1 if self._message is not None else len(self._pairs)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if self._message is not None:
+            return self._message if role == Qt.DisplayRole else None
+        name, count = self._pairs[index.row()]
+        if role == Qt.DisplayRole:
+            return f"👤 {name} ({count} encoding{'s' if count > 1 else ''})"
+        if role == Qt.UserRole:
+            return name
+        return None
 
 
 # Dialog for creating new encoding sets
@@ -193,33 +732,12 @@ class CreateEncodingDialog(QDialog):
         # Instructions with better styling
         info_label = QLabel("Create a new face encoding dataset from a folder of images.")
         info_label.setWordWrap(True)
-        info_label.setStyleSheet("""
-            color: #666;
-            font-style: italic;
-            margin-bottom: 10px;
-            padding: 15px;
-            background-color: #f8f9fa;
-            border-radius: 8px;
-            border: 1px solid #dee2e6;
-        """)
+        info_label.setObjectName("encodingInfoLabel")
         layout.addWidget(info_label)
         
         # Form group with border
         form_group = QGroupBox("Dataset Information")
-        form_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #d2d2d7;
-                border-radius: 8px;
-                margin-top: 15px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px;
-            }
-        """)
+        form_group.setObjectName("encodingDialogGroup")
         form_layout = QFormLayout(form_group)
         form_layout.setSpacing(15)
         
@@ -227,67 +745,25 @@ class CreateEncodingDialog(QDialog):
         self.name_input = QLineEdit()
         self.name_input.setMinimumHeight(40)
         self.name_input.setPlaceholderText("e.g., Class_2024_Spring, Department_Staff")
-        self.name_input.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #d2d2d7;
-                border-radius: 8px;
-                padding: 8px 12px;
-                font-size: 14px;
-                background-color: white;
-            }
-            QLineEdit:focus {
-                border-color: #0071e3;
-            }
-        """)
+        self.name_input.setObjectName("encodingNameInput")
         form_layout.addRow("Dataset Name:", self.name_input)
         
         # Description input with better styling
         self.description_input = QTextEdit()
         self.description_input.setMinimumHeight(100)
         self.description_input.setPlaceholderText("Optional: Describe this dataset (e.g., Computer Science Class 2024)")
-        self.description_input.setStyleSheet("""
-            QTextEdit {
-                border: 2px solid #d2d2d7;
-                border-radius: 8px;
-                padding: 8px;
-                font-size: 14px;
-                background-color: white;
-            }
-            QTextEdit:focus {
-                border-color: #0071e3;
-            }
-        """)
+        self.description_input.setObjectName("encodingDescriptionInput")
         form_layout.addRow("Description:", self.description_input)
         
         layout.addWidget(form_group)
         
         # Directory selection with border and better styling
         dir_group = QGroupBox("Image Directory")
-        dir_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #d2d2d7;
-                border-radius: 8px;
-                margin-top: 15px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px;
-            }
-        """)
+        dir_group.setObjectName("encodingDialogGroup")
         dir_layout = QVBoxLayout(dir_group)
         
         self.dir_label = QLabel("No directory selected")
-        self.dir_label.setStyleSheet("""
-            color: #666;
-            font-style: italic;
-            border: 1px dashed #ccc;
-            padding: 15px;
-            border-radius: 8px;
-            background-color: white;
-        """)
+        self.dir_label.setObjectName("encodingDirLabel")
         self.select_dir_button = QPushButton("Select Image Folder")
         self.select_dir_button.setMinimumHeight(40)
         self.select_dir_button.clicked.connect(self.select_directory)
@@ -298,20 +774,7 @@ class CreateEncodingDialog(QDialog):
         
         # Instructions for image naming with better styling
         naming_group = QGroupBox("Image Naming Instructions")
-        naming_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #d2d2d7;
-                border-radius: 8px;
-                margin-top: 15px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px;
-            }
-        """)
+        naming_group.setObjectName("encodingDialogGroup")
         naming_layout = QVBoxLayout(naming_group)
         
         naming_info = QLabel("""
@@ -322,12 +785,7 @@ class CreateEncodingDialog(QDialog):
         • Good lighting conditions recommended
         """)
         naming_info.setWordWrap(True)
-        naming_info.setStyleSheet("""
-            padding: 15px;
-            background-color: #f0f8ff;
-            border-radius: 8px;
-            border: 1px solid #b3d7ff;
-        """)
+        naming_info.setObjectName("encodingNamingInfo")
         naming_layout.addWidget(naming_info)
         layout.addWidget(naming_group)
         
@@ -337,12 +795,7 @@ class CreateEncodingDialog(QDialog):
         # Buttons with better styling
         button_layout = QHBoxLayout()
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
-        buttons.setStyleSheet("""
-            QPushButton {
-                min-width: 100px;
-                min-height: 40px;
-            }
-        """)
+        buttons.setObjectName("encodingDialogButtons")
         buttons.accepted.connect(self.accept)
         buttons.rejected.connect(self.reject)
         button_layout.addWidget(buttons)
@@ -358,14 +811,10 @@ class CreateEncodingDialog(QDialog):
         if directory:
             self.selected_directory = directory
             self.dir_label.setText(f"Selected: {os.path.basename(directory)}")
-            self.dir_label.setStyleSheet("""
-                color: #007acc;
-                font-weight: bold;
-                border: 2px solid #007acc;
-                padding: 15px;
-                border-radius: 8px;
-                background-color: #f8f9fa;
-            """)
+            # Restyle via the [selected="true"] rule in the main window stylesheet
+            self.dir_label.setProperty("selected", True)
+            self.dir_label.style().unpolish(self.dir_label)
+            self.dir_label.style().polish(self.dir_label)
     
     def accept(self):
         if not self.name_input.text().strip():
@@ -386,28 +835,64 @@ class CreateEncodingDialog(QDialog):
 
 # Enhanced Attendance System with Encoding Management
 class AttendanceSystem(QMainWindow):
-    def __init__(self):
+    def __init__(self, base_dir=None):
         super().__init__()
         
-        # Initialize directories
-        self.encodings_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'encodings')
-        self.attendance_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'attendance_records')
+        # Initialize directories; datasets and records live next to this file by default
+        if base_dir is None:
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+        self.encodings_directory = os.path.join(base_dir, 'encodings')
+        # Per-image encodings reused across dataset builds; holds no encodings file, so
+        # refresh_encoding_sets never lists it as a dataset
+        self.image_cache_directory = os.path.join(self.encodings_directory, '.image_cache')
+        self.attendance_directory = os.path.join(base_dir, 'attendance_records')
         os.makedirs(self.encodings_directory, exist_ok=True)
         os.makedirs(self.attendance_directory, exist_ok=True)
         
         # Initialize attendance manager
-        self.attendance_manager = AttendanceManager(os.path.dirname(os.path.abspath(__file__)))
+        self.attendance_manager = AttendanceManager(base_dir)
         
         # Initialize email settings
         self.teacher_email = ""
         self.sender_email = ""
         self.app_password = ""
+        # Logged-in SMTP connection reused across sends; see _send_message. EmailSendThread
+        # checks it out under _smtp_lock, which guards only the handle, never a network call.
+        # _close_smtp bumps the generation so a connection checked out with old credentials
+        # is logged out rather than cached again
+        self._smtp = None
+        self._smtp_generation = 0
+        self._smtp_lock = threading.Lock()
+        # The running EmailSendThread, if any; cleared when it finishes
+        self.email_thread = None
         
         # Initialize attendance data
         self.present_students = {}
+        # time.monotonic() of each student's last recorded entry, for duplicate prevention
+        self._present_seen_at = {}
+        # Names in attendance_table row order, kept sorted so new rows are inserted in place
+        self._sorted_names = []
+        # Attendance changes are written by _flush_attendance at most every 500 ms
+        self._attendance_dirty = False
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(500)
+        self._flush_timer.timeout.connect(self._flush_attendance)
         self.known_face_encodings = []
         self.known_face_names = []
+        # Distinct names of the loaded dataset, rebuilt whenever known_face_names is assigned.
+        # Older datasets list a name once per image; students who share a name count once
+        self._known_names_set = frozenset()
+        # The same names in sorted order, as stored in each day's attendance record
+        self._known_names_sorted = ()
+        # Known names not yet marked present, kept up to date as students are recognised
+        self._absent_names = set()
+        # Started by _build_settings_tab; closeEvent waits for it
+        self.camera_probe_thread = None
+        # Result of CameraProbeThread; None until the probe finishes
+        self._camera_available = None
         self.camera_active = False
+        self.face_recognition_thread = None
         
         # Load email settings
         self.load_email_settings()
@@ -475,17 +960,17 @@ class AttendanceSystem(QMainWindow):
                 alternate-background-color: #f5f5f7;
                 gridline-color: #d2d2d7;
             }
-            QListWidget {
+            QListWidget, QListView#studentsList {
                 border: 1px solid #d2d2d7;
                 border-radius: 8px;
                 alternate-background-color: #f5f5f7;
                 selection-background-color: #0071e3;
             }
-            QListWidget::item {
+            QListWidget::item, QListView#studentsList::item {
                 padding: 8px;
                 border-bottom: 1px solid #e5e5e7;
             }
-            QListWidget::item:selected {
+            QListWidget::item:selected, QListView#studentsList::item:selected {
                 background-color: #0071e3;
                 color: white;
             }
@@ -559,6 +1044,132 @@ class AttendanceSystem(QMainWindow):
                 background-color: #0071e3;
                 border-radius: 6px;
             }
+            /* Header and recognition buttons */
+            QPushButton#analyticsButton {
+                background-color: #34c759;
+                padding: 10px 20px;
+                border-radius: 8px;
+                color: white;
+                font-weight: bold;
+            }
+            QPushButton#analyticsButton:hover {
+                background-color: #30d158;
+            }
+            QPushButton#startRecognitionButton {
+                background-color: #34c759;
+                color: white;
+                border: none;
+                border-radius: 25px;
+                padding: 10px 30px;
+                font-size: 16px;
+                font-weight: bold;
+                transition: all 0.3s;
+            }
+            QPushButton#startRecognitionButton:hover {
+                background-color: #30d158;
+                transform: translateY(-2px);
+                box-shadow: 0 4px 10px rgba(52, 199, 89, 0.3);
+            }
+            QPushButton#startRecognitionButton:pressed {
+                background-color: #2cc54e;
+                transform: translateY(1px);
+                box-shadow: 0 2px 5px rgba(52, 199, 89, 0.2);
+            }
+            QPushButton#startRecognitionButton:disabled {
+                background-color: #8e8e93;
+                box-shadow: none;
+            }
+            QPushButton#stopRecognitionButton {
+                background-color: #ff3b30;
+                color: white;
+                border: none;
+                border-radius: 25px;
+                padding: 10px 30px;
+                font-size: 16px;
+                font-weight: bold;
+                transition: all 0.3s;
+            }
+            QPushButton#stopRecognitionButton:hover {
+                background-color: #ff4d42;
+                transform: translateY(-2px);
+                box-shadow: 0 4px 10px rgba(255, 59, 48, 0.3);
+            }
+            QPushButton#stopRecognitionButton:pressed {
+                background-color: #ff3226;
+                transform: translateY(1px);
+                box-shadow: 0 2px 5px rgba(255, 59, 48, 0.2);
+            }
+            QPushButton#stopRecognitionButton:disabled {
+                background-color: #8e8e93;
+                box-shadow: none;
+            }
+            /* Encoding tab groups and CreateEncodingDialog, parsed once here instead of per widget */
+            QLabel#encodingInfoLabel {
+                color: #666;
+                font-style: italic;
+                margin-bottom: 10px;
+                padding: 15px;
+                background-color: #f8f9fa;
+                border-radius: 8px;
+                border: 1px solid #dee2e6;
+            }
+            QGroupBox#encodingDialogGroup, QGroupBox#datasetGroup {
+                font-weight: bold;
+                border: 2px solid #d2d2d7;
+                border-radius: 8px;
+                margin-top: 15px;
+                padding-top: 10px;
+            }
+            QGroupBox#encodingDialogGroup::title, QGroupBox#datasetGroup::title {
+                subcontrol-origin: margin;
+                left: 15px;
+                padding: 0 10px;
+            }
+            QLineEdit#encodingNameInput {
+                border: 2px solid #d2d2d7;
+                border-radius: 8px;
+                padding: 8px 12px;
+                font-size: 14px;
+                background-color: white;
+            }
+            QLineEdit#encodingNameInput:focus {
+                border-color: #0071e3;
+            }
+            QTextEdit#encodingDescriptionInput {
+                border: 2px solid #d2d2d7;
+                border-radius: 8px;
+                padding: 8px;
+                font-size: 14px;
+                background-color: white;
+            }
+            QTextEdit#encodingDescriptionInput:focus {
+                border-color: #0071e3;
+            }
+            QLabel#encodingDirLabel {
+                color: #666;
+                font-style: italic;
+                border: 1px dashed #ccc;
+                padding: 15px;
+                border-radius: 8px;
+                background-color: white;
+            }
+            QLabel#encodingDirLabel[selected="true"] {
+                color: #007acc;
+                font-weight: bold;
+                font-style: normal;
+                border: 2px solid #007acc;
+                background-color: #f8f9fa;
+            }
+            QLabel#encodingNamingInfo {
+                padding: 15px;
+                background-color: #f0f8ff;
+                border-radius: 8px;
+                border: 1px solid #b3d7ff;
+            }
+            QDialogButtonBox#encodingDialogButtons QPushButton {
+                min-width: 100px;
+                min-height: 40px;
+            }
         """)
         
         # Set up the main UI
@@ -586,18 +1197,7 @@ class AttendanceSystem(QMainWindow):
         # Add Analytics Button in header
         self.analytics_button = QPushButton("📊 View Analytics")
         self.analytics_button.clicked.connect(self.show_analytics)
-        self.analytics_button.setStyleSheet("""
-            QPushButton {
-                background-color: #34c759;
-                padding: 10px 20px;
-                border-radius: 8px;
-                color: white;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #30d158;
-            }
-        """)
+        self.analytics_button.setObjectName("analyticsButton")
         
         header_layout.addWidget(logo_label)
         header_layout.addWidget(title_label)
@@ -645,63 +1245,13 @@ class AttendanceSystem(QMainWindow):
         self.start_button.clicked.connect(self.toggle_camera)
         self.start_button.setEnabled(False)
         self.start_button.setFixedSize(button_width, 50)  # Fixed width matching camera
-        self.start_button.setStyleSheet("""
-            QPushButton {
-                background-color: #34c759;
-                color: white;
-                border: none;
-                border-radius: 25px;
-                padding: 10px 30px;
-                font-size: 16px;
-                font-weight: bold;
-                transition: all 0.3s;
-            }
-            QPushButton:hover {
-                background-color: #30d158;
-                transform: translateY(-2px);
-                box-shadow: 0 4px 10px rgba(52, 199, 89, 0.3);
-            }
-            QPushButton:pressed {
-                background-color: #2cc54e;
-                transform: translateY(1px);
-                box-shadow: 0 2px 5px rgba(52, 199, 89, 0.2);
-            }
-            QPushButton:disabled {
-                background-color: #8e8e93;
-                box-shadow: none;
-            }
-        """)
+        self.start_button.setObjectName("startRecognitionButton")
         
-        self.stop_button = QPushButton("⏹️ Stop Recognition")
-        self.stop_button.clicked.connect(self.toggle_camera)
-        self.stop_button.setEnabled(False)
-        self.stop_button.setFixedSize(button_width, 50)  # Fixed width matching camera
-        self.stop_button.setStyleSheet("""
-            QPushButton {
-                background-color: #ff3b30;
-                color: white;
-                border: none;
-                border-radius: 25px;
-                padding: 10px 30px;
-                font-size: 16px;
-                font-weight: bold;
-                transition: all 0.3s;
-            }
-            QPushButton:hover {
-                background-color: #ff4d42;
-                transform: translateY(-2px);
-                box-shadow: 0 4px 10px rgba(255, 59, 48, 0.3);
-            }
-            QPushButton:pressed {
-                background-color: #ff3226;
-                transform: translateY(1px);
-                box-shadow: 0 2px 5px rgba(255, 59, 48, 0.2);
-            }
-            QPushButton:disabled {
-                background-color: #8e8e93;
-                box-shadow: none;
-            }
-        """)
+        self.stop_button = QPushButton("⏹️ Stop Recognition")
+        self.stop_button.clicked.connect(self.toggle_camera)
+        self.stop_button.setEnabled(False)
+        self.stop_button.setFixedSize(button_width, 50)  # Fixed width matching camera
+        self.stop_button.setObjectName("stopRecognitionButton")
         
         camera_buttons_layout.addStretch(1)  # Add flexible space before buttons
         camera_buttons_layout.addWidget(self.start_button)
@@ -737,7 +1287,6 @@ class AttendanceSystem(QMainWindow):
         self.clear_attendance_button = QPushButton("🗑️ Clear All")
         self.clear_attendance_button.clicked.connect(self.clear_attendance)
         self.clear_attendance_button.setProperty("class", "secondary")
-        self.clear_attendance_button.setStyleSheet("QPushButton { background-color: #8e8e93; }")
         
         self.generate_report_button = QPushButton("📄 Generate Report")
         self.generate_report_button.clicked.connect(self.generate_report)
@@ -775,7 +1324,6 @@ class AttendanceSystem(QMainWindow):
         self.load_different_button = QPushButton("📁 Load Different Dataset")
         self.load_different_button.clicked.connect(lambda: tab_widget.setCurrentIndex(1))
         self.load_different_button.setProperty("class", "secondary")
-        self.load_different_button.setStyleSheet("QPushButton { background-color: #8e8e93; }")
         
         current_set_layout.addWidget(self.current_set_label)
         current_set_layout.addStretch()
@@ -813,32 +1361,18 @@ class AttendanceSystem(QMainWindow):
         left_layout = QVBoxLayout(left_widget)
         
         sets_group = QGroupBox("💾 Available Datasets")
-        sets_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #d2d2d7;
-                border-radius: 8px;
-                margin-top: 15px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px;
-            }
-        """)
+        sets_group.setObjectName("datasetGroup")
         sets_layout = QVBoxLayout(sets_group)
         
         # Quick action buttons at the top
         quick_actions_layout = QHBoxLayout()
         self.create_set_button = QPushButton("➕ Create New Dataset")
         self.create_set_button.clicked.connect(self.create_new_encoding_set)
-        self.create_set_button.setStyleSheet("QPushButton { background-color: #34c759; } QPushButton:hover { background-color: #30d158; }")
+        self.create_set_button.setProperty("class", "success")
         
         self.refresh_button = QPushButton("🔄 Refresh")
         self.refresh_button.clicked.connect(self.refresh_encoding_sets)
         self.refresh_button.setProperty("class", "secondary")
-        self.refresh_button.setStyleSheet("QPushButton { background-color: #8e8e93; }")
         
         quick_actions_layout.addWidget(self.create_set_button)
         quick_actions_layout.addWidget(self.refresh_button)
@@ -859,7 +1393,7 @@ class AttendanceSystem(QMainWindow):
         self.delete_set_button = QPushButton("🗑️ Delete Selected")
         self.delete_set_button.clicked.connect(self.delete_selected_encoding_set)
         self.delete_set_button.setEnabled(False)
-        self.delete_set_button.setStyleSheet("QPushButton { background-color: #ff3b30; } QPushButton:hover { background-color: #ff4d42; }")
+        self.delete_set_button.setProperty("class", "danger")
         
         sets_buttons_layout.addWidget(self.load_set_button)
         sets_buttons_layout.addWidget(self.delete_set_button)
@@ -872,20 +1406,7 @@ class AttendanceSystem(QMainWindow):
         right_layout = QVBoxLayout(right_widget)
         
         details_group = QGroupBox("📊 Dataset Information")
-        details_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #d2d2d7;
-                border-radius: 8px;
-                margin-top: 15px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px;
-            }
-        """)
+        details_group.setObjectName("datasetGroup")
         details_layout = QVBoxLayout(details_group)
         
         # Scrollable details area
@@ -905,20 +1426,7 @@ class AttendanceSystem(QMainWindow):
         
         # Students in selected set with search
         students_group = QGroupBox("👥 Students in Dataset")
-        students_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #d2d2d7;
-                border-radius: 8px;
-                margin-top: 15px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px;
-            }
-        """)
+        students_group.setObjectName("datasetGroup")
         students_layout = QVBoxLayout(students_group)
         
         # Search functionality
@@ -926,13 +1434,28 @@ class AttendanceSystem(QMainWindow):
         search_label = QLabel("🔍 Search:")
         self.student_search = QLineEdit()
         self.student_search.setPlaceholderText("Type to search students...")
-        self.student_search.textChanged.connect(self.filter_students)
+        # Coalesce bursts of keystrokes into one filter pass
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(150)
+        self._filter_timer.timeout.connect(lambda: self.filter_students(self.student_search.text()))
+        self.student_search.textChanged.connect(lambda _text: self._filter_timer.start())
         
         search_layout.addWidget(search_label)
         search_layout.addWidget(self.student_search)
         students_layout.addLayout(search_layout)
         
-        self.students_list = QListWidget()
+        # Model/view so search filtering runs in Qt rather than per item in Python
+        self.students_model = StudentsModel()
+        self.students_proxy = QSortFilterProxyModel()
+        self.students_proxy.setSourceModel(self.students_model)
+        self.students_proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        # Filter on the bare name rather than the formatted row
+        self.students_proxy.setFilterRole(Qt.UserRole)
+        self.students_list = QListView()
+        self.students_list.setObjectName("studentsList")
+        self.students_list.setModel(self.students_proxy)
+        self.students_list.setEditTriggers(QListView.NoEditTriggers)
         self.students_list.setMinimumHeight(150)
         students_layout.addWidget(self.students_list)
         
@@ -967,9 +1490,32 @@ class AttendanceSystem(QMainWindow):
         # Add tab to tab widget
         tab_widget.addTab(encoding_tab, "🧠 Dataset Manager")
         
-        # Tab 3: Settings (Enhanced)
-        settings_tab = QWidget()
-        settings_layout = QVBoxLayout(settings_tab)
+        # Tab 3: Settings, filled in by _build_settings_tab the first time it is shown
+        self.settings_tab = QWidget()
+        self._settings_built = False
+        
+        # Recognition options are read before the tab is ever opened, so they exist up front
+        self.threshold_input = QLineEdit("0.45")
+        self.threshold_input.setPlaceholderText("0.0 to 1.0 (lower = more strict)")
+        self.duplicate_prevention = QCheckBox("Prevent duplicate entries (same person within 30 seconds)")
+        self.duplicate_prevention.setChecked(True)
+        
+        tab_widget.addTab(self.settings_tab, "⚙️ Settings")
+        tab_widget.currentChanged.connect(
+            lambda index: self._build_settings_tab() if tab_widget.widget(index) is self.settings_tab else None)
+        
+        # Add tab widget to main layout
+        main_layout.addWidget(tab_widget)
+        
+        # Status bar
+        self.statusBar().setStyleSheet("background-color: #f5f5f7; color: #1d1d1f; font-weight: bold;")
+    
+    def _build_settings_tab(self):
+        """Build the Settings tab on first open, so startup skips its widgets and the camera probe"""
+        if self._settings_built:
+            return
+        
+        settings_layout = QVBoxLayout(self.settings_tab)
         
         settings_title = QLabel("⚙️ System Settings")
         settings_title.setFont(QFont("SF Pro Display", 20, QFont.Bold))
@@ -1007,12 +1553,7 @@ class AttendanceSystem(QMainWindow):
         recognition_group = QGroupBox("🎯 Recognition Settings")
         recognition_form = QFormLayout(recognition_group)
         
-        self.threshold_input = QLineEdit("0.45")
-        self.threshold_input.setPlaceholderText("0.0 to 1.0 (lower = more strict)")
         recognition_form.addRow("🎚️ Recognition Threshold:", self.threshold_input)
-        
-        self.duplicate_prevention = QCheckBox("Prevent duplicate entries (same person within 30 seconds)")
-        self.duplicate_prevention.setChecked(True)
         recognition_form.addRow(self.duplicate_prevention)
         
         settings_layout.addWidget(recognition_group)
@@ -1021,30 +1562,56 @@ class AttendanceSystem(QMainWindow):
         system_group = QGroupBox("ℹ️ System Information")
         system_layout = QVBoxLayout(system_group)
         
-        system_info = QLabel(f"""
-        📊 Current Status:
-        • OpenCV Version: {cv2.__version__}
-        • Face Recognition Library: Available
-        • Camera Status: {'Available' if cv2.VideoCapture(0).isOpened() else 'Not Available'}
-        • Encodings Directory: {os.path.abspath(self.encodings_directory)}
-        """)
-        system_info.setStyleSheet("background-color: #f8f9fa; padding: 15px; border-radius: 8px; font-family: monospace;")
-        system_layout.addWidget(system_info)
+        # Camera status is filled in by CameraProbeThread once it finishes
+        self.system_info = QLabel(self._system_info_text())
+        self.system_info.setStyleSheet("background-color: #f8f9fa; padding: 15px; border-radius: 8px; font-family: monospace;")
+        system_layout.addWidget(self.system_info)
         
         settings_layout.addWidget(system_group)
         settings_layout.addStretch()
+        self._settings_built = True
         
-        # Add tab to tab widget
-        tab_widget.addTab(settings_tab, "⚙️ Settings")
-        
-        # Add tab widget to main layout
-        main_layout.addWidget(tab_widget)
-        
-        # Status bar
-        self.statusBar().setStyleSheet("background-color: #f5f5f7; color: #1d1d1f; font-weight: bold;")
+        # Probe the camera off the GUI thread; opening it can block for seconds. While
+        # recognition holds the device a probe would fail to open it, so skip it then
+        if not self.camera_active:
+            self.camera_probe_thread = CameraProbeThread()
+            self.camera_probe_thread.finished.connect(self.on_camera_probed)
+            self.camera_probe_thread.start()
+    
+    def _system_info_text(self):
+        """Text for the Settings tab's system information panel"""
+        if self.camera_active:
+            camera_status = 'In Use (recognition running)'
+        elif self._camera_available is None:
+            camera_status = 'Detecting...'
+        else:
+            camera_status = 'Available' if self._camera_available else 'Not Available'
+        return f"""
+        📊 Current Status:
+        • OpenCV Version: {cv2.__version__}
+        • Face Recognition Library: Available
+        • Camera Status: {camera_status}
+        • Encodings Directory: {os.path.abspath(self.encodings_directory)}
+        """
+    
+    def on_camera_probed(self, available):
+        """Cache the camera probe result and refresh the system info panel"""
+        # A probe that lost the device to a recognition run started meanwhile proves nothing
+        if self.camera_active and not available:
+            return
+        self._camera_available = available
+        self._refresh_system_info()
+    
+    def _refresh_system_info(self):
+        """Redraw the system info panel if the Settings tab has been built"""
+        if self._settings_built:
+            self.system_info.setText(self._system_info_text())
     
     def send_email(self):
         """Send attendance report via email with improved error handling"""
+        if self._email_sending():
+            return
+        
         if not self.present_students:
             QMessageBox.warning(self, "No Data", "No attendance data to send.")
             return
@@ -1061,13 +1628,13 @@ class AttendanceSystem(QMainWindow):
             msg['Subject'] = f"Attendance Report - {datetime.now().strftime('%Y-%m-%d')}"
             
             # Calculate statistics
-            total_students = len(set(self.known_face_names))
+            total_students = len(self._known_names_set)
             present_count = len(self.present_students)
             absent_count = total_students - present_count
             attendance_rate = (present_count / total_students * 100) if total_students > 0 else 0
             
             # Create email body
-            body = f"""
+            parts = [f"""
             Attendance Report
             Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             
@@ -1077,42 +1644,111 @@ class AttendanceSystem(QMainWindow):
             - Absent: {absent_count}
             
             Present Students:
-            """
+            """]
             
-            for name, time in sorted(self.present_students.items()):
-                body += f"• {name} - {time}\n"
+            parts.extend(f"• {name} - {time}\n" for name, time in sorted(self.present_students.items()))
             
             # Add absent students
-            absent_students = set(self.known_face_names) - set(self.present_students.keys())
+            absent_students = self._absent_names
             if absent_students:
-                body += "\nAbsent Students:\n"
-                for name in sorted(absent_students):
-                    body += f"• {name}\n"
-            
-            msg.attach(MIMEText(body, 'plain'))
+                parts.append("\nAbsent Students:\n")
+                parts.extend(f"• {name}\n" for name in sorted(absent_students))
             
-            # Connect to SMTP server with error handling and timeout
-            try:
-                server = smtplib.SMTP('smtp.gmail.com', 587, timeout=10)
-                server.starttls()
-                server.login(self.sender_email, self.app_password)
-                server.send_message(msg)
-                server.quit()
-                
-                QMessageBox.information(self, "Success", f"Attendance report sent to {self.teacher_email}")
-                
-            except smtplib.SMTPAuthenticationError:
-                QMessageBox.critical(self, "Authentication Error", 
-                    "Failed to authenticate with email server. Please check your email and app password.")
-            except smtplib.SMTPException as e:
-                QMessageBox.critical(self, "SMTP Error", 
-                    f"An error occurred while sending email: {str(e)}")
-            except TimeoutError:
-                QMessageBox.critical(self, "Timeout Error", 
-                    "Connection to email server timed out. Please check your internet connection.")
+            msg.attach(MIMEText(''.join(parts), 'plain'))
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to send email: {str(e)}")
+            return
+        
+        # Send on a worker thread; the SMTP round trips can take up to the 10 s timeout
+        self.send_email_button.setEnabled(False)
+        self.statusBar().showMessage(f"Sending attendance report to {self.teacher_email}...")
+        self.email_thread = EmailSendThread(self._send_message, msg, parent=self)
+        self.email_thread.sent.connect(self.on_email_sent)
+        self.email_thread.failed.connect(self.on_email_failed)
+        self.email_thread.finished.connect(self._on_email_thread_finished)
+        self.email_thread.start()
+    
+    def _email_sending(self):
+        """Whether an EmailSendThread is still running"""
+        return self.email_thread is not None and self.email_thread.isRunning()
+    
+    def _on_email_thread_finished(self):
+        """Release the finished EmailSendThread and allow the next send"""
+        thread = self.sender()
+        if thread is self.email_thread:
+            self.email_thread = None
+            self.send_email_button.setEnabled(True)
+        thread.deleteLater()
+    
+    def on_email_sent(self):
+        """Report a successful send from EmailSendThread"""
+        self.statusBar().showMessage(f"Attendance report sent to {self.teacher_email}")
+        QMessageBox.information(self, "Success", f"Attendance report sent to {self.teacher_email}")
+    
+    def on_email_failed(self, title, message):
+        """Report a failed send from EmailSendThread"""
+        self.statusBar().showMessage("Failed to send attendance report")
+        QMessageBox.critical(self, title, message)
+    
+    def _send_message(self, msg):
+        """Send msg over the cached SMTP connection, reconnecting once if it has dropped"""
+        # Check the connection out so the lock is never held across a network call
+        with self._smtp_lock:
+            server, self._smtp = self._smtp, None
+            generation = self._smtp_generation
+        try:
+            if server is not None:
+                try:
+                    server.send_message(msg)
+                except (smtplib.SMTPServerDisconnected, OSError):
+                    # The server timed out the idle connection; log in again below
+                    server.close()
+                    server = None
+            if server is None:
+                server = self._connect_smtp()
+                server.send_message(msg)
+        except (smtplib.SMTPException, OSError):
+            if server is not None:
+                server.close()
+            raise
+        self._return_smtp(server, generation)
+
+    def _connect_smtp(self):
+        """Open and log in a new SMTP connection"""
+        # Implicit TLS on 465 skips the STARTTLS round trip
+        server = smtplib.SMTP_SSL('smtp.gmail.com', 465, timeout=10)
+        try:
+            server.login(self.sender_email, self.app_password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def _return_smtp(self, server, generation):
+        """Cache server for the next send unless the settings changed while it was checked out"""
+        with self._smtp_lock:
+            if generation == self._smtp_generation and self._smtp is None:
+                self._smtp = server
+                return
+        self._quit_smtp(server)
+    
+    def _close_smtp(self):
+        """Forget the cached SMTP connection, logging it out off the GUI thread"""
+        with self._smtp_lock:
+            server, self._smtp = self._smtp, None
+            self._smtp_generation += 1
+        if server is not None:
+            # QUIT is a server round trip; a daemon thread keeps it off the event loop
+            threading.Thread(target=self._quit_smtp, args=(server,), daemon=True).start()
+    
+    @staticmethod
+    def _quit_smtp(server):
+        """Log out of server, closing the socket if the server is already gone"""
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
 
     def save_email_settings(self):
         """Save email configuration settings with improved error handling"""
@@ -1128,26 +1764,25 @@ class AttendanceSystem(QMainWindow):
                 QMessageBox.warning(self, "Invalid Email", "Please enter valid email addresses.")
                 return
             
-            # Create backup of existing config
-            if os.path.exists('email_config.json'):
-                shutil.copy2('email_config.json', 'email_config.json.bak')
-            
-            # Save new config
-            with open('email_config.json', 'w') as f:
+            # Write to a temp file and swap it in, so a failed write never leaves a torn config
+            tmp_file = 'email_config.json.tmp'
+            with open(tmp_file, 'w') as f:
                 json.dump(config, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, 'email_config.json')
             
             # Update instance variables
             self.teacher_email = config['teacher_email']
             self.sender_email = config['sender_email']
             self.app_password = config['app_password']
+            # The cached connection is logged in with the old credentials
+            self._close_smtp()
             
             QMessageBox.information(self, "Settings Saved", "Email settings have been saved successfully!")
             
         except Exception as e:
             QMessageBox.critical(self, "Save Error", f"Could not save settings: {str(e)}")
-            # Restore backup if it exists
-            if os.path.exists('email_config.json.bak'):
-                shutil.copy2('email_config.json.bak', 'email_config.json')
 
     def load_email_settings(self):
         """Load email configuration with improved error handling"""
@@ -1167,44 +1802,81 @@ class AttendanceSystem(QMainWindow):
 
     def _validate_email(self, email):
         """Validate email address format"""
-        import re
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        return bool(_EMAIL_RE.match(email))
 
     def refresh_encoding_sets(self):
         """Refresh the list of available encoding datasets"""
-        self.encoding_sets_list.clear()
-        
-        if not os.path.exists(self.encodings_directory):
-            return
+        # Collect the items first, then swap them in with a single repaint
+        items = []
         
-        # Look for encoding files in the directory
-        for item in os.listdir(self.encodings_directory):
-            item_path = os.path.join(self.encodings_directory, item)
-            if os.path.isdir(item_path):
-                encoding_file = os.path.join(item_path, 'encodings.pkl')
-                info_file = os.path.join(item_path, 'info.json')
+        # Look for encoding files in the directory; scandir gives the type without a stat per entry
+        try:
+            with os.scandir(self.encodings_directory) as entries:
+                dataset_dirs = [entry for entry in entries if entry.is_dir(follow_symlinks=False)]
+        except FileNotFoundError:
+            dataset_dirs = []
+        
+        for entry in dataset_dirs:
+            encoding_file, encoding_stat = self._stat_encoding_file(entry.path)
+            if not encoding_file:
+                continue
+            
+            try:
+                list_item = QListWidgetItem(f"📁 {entry.name}")
                 
-                if os.path.exists(encoding_file):
-                    try:
-                        list_item = QListWidgetItem(f"📁 {item}")
-                        
-                        # Add metadata if available
-                        if os.path.exists(info_file):
-                            with open(info_file, 'r') as f:
-                                info = json.load(f)
-                                student_count = info.get('student_count', 0)
-                                list_item.setText(f"📁 {item} ({student_count} students)")
-                        
-                        list_item.setData(Qt.UserRole, item_path)
-                        self.encoding_sets_list.addItem(list_item)
-                    except Exception as e:
-                        print(f"Error loading dataset {item}: {e}")
-                        
+                # Add metadata if available
+                try:
+                    with open(os.path.join(entry.path, 'info.json'), 'r') as f:
+                        info = json.load(f)
+                    student_count = info.get('student_count', 0)
+                    list_item.setText(f"📁 {entry.name} ({student_count} students)")
+                    list_item.setData(Qt.UserRole + 1, info)
+                except FileNotFoundError:
+                    pass
+                
+                list_item.setData(Qt.UserRole, entry.path)
+                # Keep the info and stat so selecting the item doesn't touch the disk again
+                list_item.setData(Qt.UserRole + 2, encoding_stat.st_size)
+                items.append(list_item)
+            except Exception as e:
+                print(f"Error loading dataset {entry.name}: {e}")
+        
         # Update UI state
-        has_items = self.encoding_sets_list.count() > 0
-        if not has_items:
-            self.encoding_sets_list.addItem("No encoding datasets found")
+        if not items:
+            items.append(QListWidgetItem("No encoding datasets found"))
+        self._populate_list(self.encoding_sets_list, items)
+    
+    @staticmethod
+    def _populate_list(list_widget, items):
+        """Replace a QListWidget's items with layout, sorting and signals suspended"""
+        list_widget.setUpdatesEnabled(False)
+        list_widget.blockSignals(True)
+        sorting = list_widget.isSortingEnabled()
+        list_widget.setSortingEnabled(False)
+        try:
+            list_widget.clear()
+            for item in items:
+                list_widget.addItem(item)
+        finally:
+            list_widget.setSortingEnabled(sorting)
+            list_widget.blockSignals(False)
+            list_widget.setUpdatesEnabled(True)
+    
+    @staticmethod
+    def _stat_encoding_file(dataset_path):
+        """Return (path, stat) of the dataset's encodings file (.npz, or .pkl for older sets), or (None, None)"""
+        for filename in ('encodings.npz', 'encodings.pkl'):
+            encoding_file = os.path.join(dataset_path, filename)
+            try:
+                return encoding_file, os.stat(encoding_file)
+            except FileNotFoundError:
+                continue
+        return None, None
+    
+    @classmethod
+    def _find_encoding_file(cls, dataset_path):
+        """Return the dataset's encodings file (.npz, or .pkl for older sets), or None"""
+        return cls._stat_encoding_file(dataset_path)[0]
     
     def on_encoding_set_selected(self, item):
         """Handle selection of an encoding dataset"""
@@ -1215,31 +1887,30 @@ class AttendanceSystem(QMainWindow):
         self.load_set_button.setEnabled(True)
         self.delete_set_button.setEnabled(True)
         
-        # Load and display dataset information
-        info_file = os.path.join(dataset_path, 'info.json')
-        encoding_file = os.path.join(dataset_path, 'encodings.pkl')
+        # Display dataset information, using what refresh_encoding_sets already read
+        info = item.data(Qt.UserRole + 1)
+        file_size = item.data(Qt.UserRole + 2)
         
         details_text = f"📂 Dataset: {os.path.basename(dataset_path)}\n"
         details_text += f"📍 Location: {dataset_path}\n\n"
         
-        if os.path.exists(info_file):
+        info_file = os.path.join(dataset_path, 'info.json')
+        if info is None and os.path.exists(info_file):
             try:
                 with open(info_file, 'r') as f:
                     info = json.load(f)
-                    details_text += f"📝 Description: {info.get('description', 'No description')}\n"
-                    details_text += f"📅 Created: {info.get('created_date', 'Unknown')}\n"
-                    details_text += f"👥 Students: {info.get('student_count', 0)}\n"
-                    details_text += f"🖼️ Images Processed: {info.get('images_processed', 0)}\n"
             except:
                 details_text += "⚠️ Could not load dataset information\n"
         
-        # Check encoding file
-        if os.path.exists(encoding_file):
-            try:
-                file_size = os.path.getsize(encoding_file)
-                details_text += f"💾 Encoding File Size: {file_size /1024:.1f} KB\n"
-            except:
-                pass
+        if info is not None:
+            details_text += f"📝 Description: {info.get('description', 'No description')}\n"
+            details_text += f"📅 Created: {info.get('created_date', 'Unknown')}\n"
+            details_text += f"👥 Students: {info.get('student_count', 0)}\n"
+            details_text += f"🖼️ Images Processed: {info.get('images_processed', 0)}\n"
+        
+        # Encoding file size was recorded by refresh_encoding_sets
+        if file_size is not None:
+            details_text += f"💾 Encoding File Size: {file_size /1024:.1f} KB\n"
         
         self.details_text.setText(details_text)
         
@@ -1248,37 +1919,44 @@ class AttendanceSystem(QMainWindow):
     
     def load_student_list(self, dataset_path):
         """Load and display the list of students in the selected dataset"""
-        self.students_list.clear()
-        
-        encoding_file = os.path.join(dataset_path, 'encodings.pkl')
-        
-        if os.path.exists(encoding_file):
-            try:
-                with open(encoding_file, 'rb') as f:
-                    data = pickle.load(f)
-                    names = data.get('names', [])
-                    
-                    for name in sorted(set(names)):  # Remove duplicates and sort
-                        count = names.count(name)
-                        item = QListWidgetItem(f"👤 {name} ({count} encoding{'s' if count > 1 else ''})")
-                        self.students_list.addItem(item)
-                    
-                    self.student_count_label.setText(f"Total: {len(set(names))} students")
-            except Exception as e:
-                self.students_list.addItem(QListWidgetItem(f"⚠️ Error loading student data: {str(e)}"))
-                self.student_count_label.setText("Total: 0 students")
+        self._student_list_path = dataset_path
+        encoding_file = self._find_encoding_file(dataset_path)
+        
+        if encoding_file:
+            # Read names on the thread pool; on_student_names_loaded fills the list
+            self.students_model.setMessage("Loading students...")
+            job = StudentNamesJob(dataset_path, encoding_file)
+            job.signals.finished.connect(self.on_student_names_loaded)
+            QThreadPool.globalInstance().start(job)
         else:
-            self.students_list.addItem(QListWidgetItem("⚠️ No encoding data found"))
+            self.students_model.setMessage("⚠️ No encoding data found")
+            self.student_count_label.setText("Total: 0 students")
+    
+    def on_student_names_loaded(self, dataset_path, names, error):
+        """Show the student names read by a StudentNamesJob"""
+        # Ignore results for a dataset that is no longer selected
+        if dataset_path != self._student_list_path:
+            return
+        
+        if names is None:
+            self.students_model.setMessage(f"⚠️ Error loading student data: {error}")
             self.student_count_label.setText("Total: 0 students")
+            return
+        
+        # Count each name's encodings in one pass
+        counts = Counter(names)
+        self.students_model.setPairs(sorted(counts.items()))
+        self.student_count_label.setText(f"Total: {len(counts)} students")
     
     def filter_students(self, text):
-        """Filter the student list based on search text"""
-        for i in range(self.students_list.count()):
-            item = self.students_list.item(i)
-            if text.lower() in item.text().lower():
-                item.setHidden(False)
-            else:
-                item.setHidden(True)
+        """Filter the student list to names starting with the search text"""
+        if not text:
+            self.students_proxy.setFilterFixedString("")
+            return
+        # Anchored at the start of the name so non-matching rows fail on the first character
+        self.students_proxy.setFilterRegularExpression(
+            QRegularExpression("^" + QRegularExpression.escape(text),
+                               QRegularExpression.CaseInsensitiveOption))
     
     def create_new_encoding_set(self):
         """Create a new face encoding dataset"""
@@ -1312,7 +1990,7 @@ class AttendanceSystem(QMainWindow):
         self.progress_label.setText("Creating encoding dataset...")
         
         # Create and start the loading thread
-        self.load_thread = LoadStudentsThread(source_directory)
+        self.load_thread = LoadStudentsThread(source_directory, self.image_cache_directory)
         self.load_thread.progress.connect(self.update_progress)
         self.load_thread.finished.connect(lambda encodings, names, count: self.save_encoding_set(
             dataset_path, dataset_name, description, encodings, names, count, source_directory))
@@ -1320,16 +1998,23 @@ class AttendanceSystem(QMainWindow):
     
     def update_progress(self, message):
         """Update the progress label with current operation"""
+        # Progress arrives as a queued signal from LoadStudentsThread, so the
+        # event loop is already free to repaint; no processEvents needed
         self.progress_label.setText(message)
-        QApplication.processEvents()  # Keep UI responsive
     
     def save_encoding_set(self, dataset_path, name, description, encodings, names, count, source_dir):
         """Save the processed encoding dataset"""
         try:
             # Save encodings
-            encoding_file = os.path.join(dataset_path, 'encodings.pkl')
-            with open(encoding_file, 'wb') as f:
-                pickle.dump({'encodings': encodings, 'names': names}, f)
+            # Half precision is ample for face distances and halves the file
+            encoding_file = os.path.join(dataset_path, 'encodings.npz')
+            np.savez(encoding_file,
+                     encodings=np.asarray(encodings, dtype=np.float16).reshape(-1, 128),
+                     names=np.array(names, dtype=str))
+            # Drop an older pickle so it can't shadow or go stale next to the new file
+            legacy_file = os.path.join(dataset_path, 'encodings.pkl')
+            if os.path.exists(legacy_file):
+                os.remove(legacy_file)
             
             # Save dataset info
             info_file = os.path.join(dataset_path, 'info.json')
@@ -1366,38 +2051,67 @@ class AttendanceSystem(QMainWindow):
             return
         
         dataset_path = current_item.data(Qt.UserRole)
-        encoding_file = os.path.join(dataset_path, 'encodings.pkl')
+        encoding_file = self._find_encoding_file(dataset_path)
+        if not encoding_file:
+            QMessageBox.critical(self, "Load Error", f"Failed to load dataset: No encodings file in {dataset_path}")
+            return
         
-        try:
-            with open(encoding_file, 'rb') as f:
-                data = pickle.load(f)
-                self.known_face_encodings = data['encodings']
-                self.known_face_names = data['names']
-            
-            # Update UI
-            self.current_encoding_set = os.path.basename(dataset_path)
-            self.current_set_label.setText(f"Loaded: {self.current_encoding_set} ({len(set(self.known_face_names))} students)")
-            self.current_set_label.setStyleSheet("color: #34c759; font-weight: bold; font-size: 14px;")
-            
-            # Enable recognition controls
-            self.start_button.setEnabled(True)
-            self.generate_report_button.setEnabled(True)
-            self.send_email_button.setEnabled(True)
-            
-            # Update status
-            self.status_indicator.setText("🟢 Ready for Recognition")
-            self.status_indicator.setStyleSheet("color: #34c759; font-weight: bold; font-size: 16px;")
-            
-            # Update statistics
-            self.update_statistics();
-            
-            self.statusBar().showMessage(f"Dataset '{self.current_encoding_set}' loaded successfully. Ready for face recognition.");
-            
-            QMessageBox.information(self, "Dataset Loaded", 
-                                  f"Successfully loaded '{self.current_encoding_set}' with {len(set(self.known_face_names))} students.")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Load Error", f"Failed to load dataset: {str(e)}")
+        # Show progress while the file is read in the background
+        self.load_set_button.setEnabled(False)
+        self.progress_bar.setVisible(True)
+        self.progress_label.setVisible(True)
+        self.progress_bar.setRange(0, 0)  # Indeterminate progress
+        self.progress_label.setText("Loading encoding dataset...")
+        
+        self.encoding_load_thread = LoadEncodingSetThread(encoding_file)
+        self.encoding_load_thread.finished.connect(
+            lambda encodings, names: self.on_encoding_set_loaded(dataset_path, encodings, names))
+        self.encoding_load_thread.failed.connect(self.on_encoding_set_load_failed)
+        self.encoding_load_thread.start()
+    
+    def _finish_encoding_set_load(self):
+        """Hide the load progress and re-enable the load button"""
+        self.progress_bar.setVisible(False)
+        self.progress_label.setVisible(False)
+        self.load_set_button.setEnabled(True)
+    
+    def on_encoding_set_loaded(self, dataset_path, encodings, names):
+        """Activate an encoding dataset read by LoadEncodingSetThread"""
+        self._finish_encoding_set_load()
+        self.known_face_encodings = encodings
+        self.known_face_names = names
+        self._known_names_set = frozenset(names)
+        self._known_names_sorted = tuple(sorted(self._known_names_set))
+        # A mutable copy; update_attendance_record discards names from it
+        self._absent_names = set(self._known_names_set).difference(self.present_students)
+        
+        # Update UI
+        self.current_encoding_set = os.path.basename(dataset_path)
+        self.current_set_label.setText(f"Loaded: {self.current_encoding_set} ({len(self._known_names_set)} students)")
+        self.current_set_label.setStyleSheet("color: #34c759; font-weight: bold; font-size: 14px;")
+        
+        # Enable recognition controls
+        self.start_button.setEnabled(True)
+        self.generate_report_button.setEnabled(True)
+        # Stays disabled until a send in progress finishes, see _on_email_thread_finished
+        self.send_email_button.setEnabled(not self._email_sending())
+        
+        # Update status
+        self.status_indicator.setText("🟢 Ready for Recognition")
+        self.status_indicator.setStyleSheet("color: #34c759; font-weight: bold; font-size: 16px;")
+        
+        # Update statistics
+        self.update_statistics();
+        
+        self.statusBar().showMessage(f"Dataset '{self.current_encoding_set}' loaded successfully. Ready for face recognition.");
+        
+        QMessageBox.information(self, "Dataset Loaded", 
+                              f"Successfully loaded '{self.current_encoding_set}' with {len(self._known_names_set)} students.")
+    
+    def on_encoding_set_load_failed(self, error):
+        """Report a dataset that LoadEncodingSetThread could not read"""
+        self._finish_encoding_set_load()
+        QMessageBox.critical(self, "Load Error", f"Failed to load dataset: {error}")
     
     def delete_selected_encoding_set(self):
         """Delete the selected encoding dataset"""
@@ -1415,17 +2129,19 @@ class AttendanceSystem(QMainWindow):
         
         if reply == QMessageBox.Yes:
             try:
-                import shutil
                 shutil.rmtree(dataset_path)
                 self.refresh_encoding_sets()
                 self.details_text.clear()
-                self.students_list.clear()
+                self.students_model.setMessage(None)
                 self.student_count_label.setText("Total: 0 students")
                 
                 # If this was the current dataset, reset
                 if self.current_encoding_set == dataset_name:
                     self.known_face_encodings = []
                     self.known_face_names = []
+                    self._known_names_set = frozenset()
+                    self._known_names_sorted = ()
+                    self._absent_names = set()
                     self.current_encoding_set = None
                     self.current_set_label.setText("No encoding dataset loaded")
                     self.current_set_label.setStyleSheet("color: #8e8e93; font-style: italic; font-size: 14px;")
@@ -1447,7 +2163,7 @@ class AttendanceSystem(QMainWindow):
     
     def start_recognition(self):
         """Start face recognition"""
-        if not self.known_face_encodings:
+        if len(self.known_face_encodings) == 0:
             QMessageBox.warning(self, "No Dataset", "Please load an encoding dataset first.")
             return
         
@@ -1464,14 +2180,16 @@ class AttendanceSystem(QMainWindow):
         self.face_recognition_thread = FaceRecognitionThread(
             self.known_face_encodings, 
             self.known_face_names, 
-            threshold
+            threshold,
+            display_size=(self.camera_label.width(), self.camera_label.height())
         )
-        self.face_recognition_thread.update_frame.connect(self.update_camera_display)
+        self.face_recognition_thread.frame_ready.connect(self.update_camera_display)
         self.face_recognition_thread.update_attendance.connect(self.update_attendance_record)
         self.face_recognition_thread.start()
         
         # Update UI
         self.camera_active = True
+        self._refresh_system_info()
         self.start_button.setEnabled(False)
         self.stop_button.setEnabled(True)
         self.statusBar().showMessage("Face recognition active. Point camera at students.")
@@ -1488,6 +2206,7 @@ class AttendanceSystem(QMainWindow):
         
         # Update UI
         self.camera_active = False
+        self._refresh_system_info()
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
         
@@ -1501,69 +2220,87 @@ class AttendanceSystem(QMainWindow):
         self.status_indicator.setText("🟢 Ready for Recognition")
         self.status_indicator.setStyleSheet("color: #34c759; font-weight: bold; font-size: 16px;")
     
-    def update_camera_display(self, frame, face_locations, names, encodings):
-        """Update the camera display with detected faces"""
-        # Draw rectangles and names on detected faces
-        for (top, right, bottom, left), name in zip(face_locations, names):
-            # Choose color based on recognition status
-            color = (0, 255, 0) if name != "Unknown" else (0, 0, 255)  # Green for known, red for unknown
-            
-            # Draw rectangle around face
-            cv2.rectangle(frame, (left, top), (right, bottom), color, 2)
-            
-            # Draw label background
-            cv2.rectangle(frame, (left, bottom - 35), (right, bottom), color, cv2.FILLED)
-            
-            # Draw name text
-            font = cv2.FONT_HERSHEY_DUPLEX
-            cv2.putText(frame, name, (left + 6, bottom - 6), font, 0.6, (255, 255, 255), 1)
-        
-        # Convert frame to Qt format and display
-        rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb_image.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
-        
-        # Scale image to fit label
-        pixmap = QPixmap.fromImage(qt_image)
-        scaled_pixmap = pixmap.scaled(self.camera_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        self.camera_label.setPixmap(scaled_pixmap)
+    def update_camera_display(self):
+        """Update the camera display with the newest annotated frame from the recognition thread"""
+        # Frames that arrived while the GUI was busy were replaced in the slot, not queued
+        if self.face_recognition_thread is None:
+            return
+        qt_image = self.face_recognition_thread.take_frame()
+        if qt_image is None:
+            return
+        # The thread already fitted the frame to the label, so no rescale on the GUI thread
+        self.camera_label.setPixmap(QPixmap.fromImage(qt_image))
     
     def update_attendance_record(self, name, timestamp):
         """Update attendance record for a recognized student"""
-        if not self.duplicate_prevention.isChecked() or \
-           name not in self.present_students or \
-           (datetime.now() - datetime.strptime(self.present_students[name], "%Y-%m-%d %H:%M:%S")).seconds > 30:
+        now = time.monotonic()
+        last = self._present_seen_at.get(name)
+        if not self.duplicate_prevention.isChecked() or last is None or now - last > 30.0:
             
+            self._present_seen_at[name] = now
             self.present_students[name] = timestamp
-            self.refresh_attendance_table()
+            self._absent_names.discard(name)
+            self._set_attendance_row(name, timestamp)
             
-            # Save attendance to database
-            self.attendance_manager.save_attendance(
-                datetime.now(),
-                list(self.present_students.keys()),
-                self.known_face_names
-            )
-            
-            # Update analytics if tab exists
-            if hasattr(self, 'analytics_tab'):
-                self.analytics_tab.update_student_list(self.known_face_names)
-                self.analytics_tab.update_chart()
+            # Coalesce the save with any other students recognised in the next 500 ms
+            self._attendance_dirty = True
+            if not self._flush_timer.isActive():
+                self._flush_timer.start()
             
             # Update statistics
             self.update_statistics()
     
-    def refresh_attendance_table(self):
-        """Refresh the attendance table display"""
-        self.attendance_table.setRowCount(len(self.present_students))
+    def _flush_attendance(self):
+        """Save pending attendance changes and refresh the analytics"""
+        if not self._attendance_dirty:
+            return
+        self._attendance_dirty = False
+        
+        # Save attendance to database
+        self.attendance_manager.save_attendance(
+            datetime.now(),
+            self.present_students,
+            self._known_names_sorted
+        )
+        
+        # Update analytics if tab exists
+        if hasattr(self, 'analytics_tab'):
+            self.analytics_tab.update_student_list(self.known_face_names)
+            self.analytics_tab.update_chart()
+    
+    def _set_attendance_row(self, name, time):
+        """Update one student's row, inserting it at its sorted position if new"""
+        row = bisect.bisect_left(self._sorted_names, name)
+        if row < len(self._sorted_names) and self._sorted_names[row] == name:
+            self.attendance_table.item(row, 1).setText(time)
+            return
         
-        for row, (name, time) in enumerate(sorted(self.present_students.items())):
-            self.attendance_table.setItem(row, 0, QTableWidgetItem(name))
-            self.attendance_table.setItem(row, 1, QTableWidgetItem(time))
+        self._sorted_names.insert(row, name)
+        self.attendance_table.insertRow(row)
+        self.attendance_table.setItem(row, 0, QTableWidgetItem(name))
+        self.attendance_table.setItem(row, 1, QTableWidgetItem(time))
+    
+    def refresh_attendance_table(self):
+        """Rebuild the whole attendance table from present_students"""
+        self._sorted_names = sorted(self.present_students)
+        table = self.attendance_table
+        
+        # Fill every row with painting and sorting suspended, then repaint once
+        table.setUpdatesEnabled(False)
+        sorting = table.isSortingEnabled()
+        table.setSortingEnabled(False)
+        try:
+            table.setRowCount(len(self._sorted_names))
+            for row, name in enumerate(self._sorted_names):
+                table.setItem(row, 0, QTableWidgetItem(name))
+                table.setItem(row, 1, QTableWidgetItem(self.present_students[name]))
+        finally:
+            table.setSortingEnabled(sorting)
+            table.setUpdatesEnabled(True)
     
     def update_statistics(self):
         """Update attendance statistics"""
-        total_students = len(set(self.known_face_names)) if self.known_face_names else 0
+        total_students = len(self._known_names_set)
         present_count = len(self.present_students)
         absent_count = total_students - present_count
         
@@ -1590,8 +2327,14 @@ class AttendanceSystem(QMainWindow):
                                    QMessageBox.Yes | QMessageBox.No)
         
         if reply == QMessageBox.Yes:
+            # Drop any pending save, so the timer can't write back an empty record for today
+            self._flush_timer.stop()
+            self._attendance_dirty = False
+            
             # Clear in-memory data
             self.present_students.clear()
+            self._present_seen_at.clear()
+            self._absent_names = set(self._known_names_set)
             self.refresh_attendance_table()
             self.update_statistics()
             
@@ -1601,6 +2344,25 @@ class AttendanceSystem(QMainWindow):
             else:
                 self.statusBar().showMessage("No attendance records found for today.")
     
+    @staticmethod
+    def _draw_report_lines(c, lines, y_position):
+        """Draw list lines as one text object per page and return the y below the last line"""
+        def new_text(y):
+            text = c.beginText(70, y)
+            text.setFont("Helvetica", 10)
+            text.setLeading(20)
+            return text
+        
+        text = new_text(y_position)
+        for line in lines:
+            text.textLine(line)
+            if text.getY() < 50:  # New page if needed
+                c.drawText(text)
+                c.showPage()
+                text = new_text(800)
+        c.drawText(text)
+        return text.getY()
+    
     def generate_report(self):
         """Generate a PDF attendance report"""
         if not self.present_students:
@@ -1630,28 +2392,20 @@ class AttendanceSystem(QMainWindow):
             c.drawString(50, 760, f"Dataset: {self.current_encoding_set or 'Unknown'}")
             
             # Statistics
-            c.drawString(50, 720, f"Total Students: {len(set(self.known_face_names))}")
+            c.drawString(50, 720, f"Total Students: {len(self._known_names_set)}")
             c.drawString(50, 700, f"Present: {len(self.present_students)}")
-            c.drawString(50, 680, f"Absent: {len(set(self.known_face_names)) - len(self.present_students)}")
+            c.drawString(50, 680, f"Absent: {len(self._known_names_set) - len(self.present_students)}")
             
             # Present students
             c.setFont("Helvetica-Bold", 14)
             c.drawString(50, 640, "PRESENT STUDENTS:")
             
-            c.setFont("Helvetica", 10)
-            y_position = 620
-            
-            for name, time in sorted(self.present_students.items()):
-                c.drawString(70, y_position, f"• {name} - {time}")
-                y_position -= 20
-                
-                if y_position < 50:  # New page if needed
-                    c.showPage()
-                    y_position = 800
+            y_position = self._draw_report_lines(
+                c, (f"• {name} - {time}" for name, time in sorted(self.present_students.items())), 620)
             
             # Absent students
             if self.known_face_names:
-                absent_students = set(self.known_face_names) - set(self.present_students.keys())
+                absent_students = sorted(self._absent_names)
                 
                 if absent_students:
                     if y_position < 200:  # New page if needed
@@ -1660,16 +2414,8 @@ class AttendanceSystem(QMainWindow):
                     
                     c.setFont("Helvetica-Bold", 14)
                     c.drawString(50, y_position, "ABSENT STUDENTS:")
-                    y_position -= 20
                     
-                    c.setFont("Helvetica", 10)
-                    for name in sorted(absent_students):
-                        c.drawString(70, y_position, f"• {name}")
-                        y_position -= 20
-                        
-                        if y_position < 50:  # New page if needed
-                            c.showPage()
-                            y_position = 800
+                    self._draw_report_lines(c, (f"• {name}" for name in absent_students), y_position - 20)
             
             c.save()
             
@@ -1678,81 +2424,22 @@ class AttendanceSystem(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Report Error", f"Failed to generate report: {str(e)}")
     
-    def send_email(self):
-        """Send attendance report via email with improved error handling"""
-        if not self.present_students:
-            QMessageBox.warning(self, "No Data", "No attendance data to send.")
-            return
-        
-        if not all([self.teacher_email, self.sender_email, self.app_password]):
-            QMessageBox.warning(self, "Email Settings", "Please configure email settings first.")
-            return
-        
-        try:
-            # Create email message
-            msg = MIMEMultipart()
-            msg['From'] = self.sender_email
-            msg['To'] = self.teacher_email
-            msg['Subject'] = f"Attendance Report - {datetime.now().strftime('%Y-%m-%d')}"
-            
-            # Calculate statistics
-            total_students = len(set(self.known_face_names))
-            present_count = len(self.present_students)
-            absent_count = total_students - present_count
-            attendance_rate = (present_count / total_students * 100) if total_students > 0 else 0
-            
-            # Create email body
-            body = f"""
-            Attendance Report
-            Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-            
-            Statistics:
-            - Total Students: {total_students}
-            - Present: {present_count} ({attendance_rate:.1f}%)
-            - Absent: {absent_count}
-            
-            Present Students:
-            """
-            
-            for name, time in sorted(self.present_students.items()):
-                body += f"• {name} - {time}\n"
-            
-            # Add absent students
-            absent_students = set(self.known_face_names) - set(self.present_students.keys())
-            if absent_students:
-                body += "\nAbsent Students:\n"
-                for name in sorted(absent_students):
-                    body += f"• {name}\n"
-            
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Connect to SMTP server with error handling and timeout
-            try:
-                server = smtplib.SMTP('smtp.gmail.com', 587, timeout=10)
-                server.starttls()
-                server.login(self.sender_email, self.app_password)
-                server.send_message(msg)
-                server.quit()
-                
-                QMessageBox.information(self, "Success", f"Attendance report sent to {self.teacher_email}")
-                
-            except smtplib.SMTPAuthenticationError:
-                QMessageBox.critical(self, "Authentication Error", 
-                    "Failed to authenticate with email server. Please check your email and app password.")
-            except smtplib.SMTPException as e:
-                QMessageBox.critical(self, "SMTP Error", 
-                    f"An error occurred while sending email: {str(e)}")
-            except TimeoutError:
-                QMessageBox.critical(self, "Timeout Error", 
-                    "Connection to email server timed out. Please check your internet connection.")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to send email: {str(e)}")
-    
     def closeEvent(self, event):
         """Handle application close event"""
-        if self.face_recognition_thread:
+        if self.face_recognition_thread is not None:
             self.face_recognition_thread.stop()
+        # Qt aborts if a running QThread is destroyed, so let an in-flight email finish. Hide
+        # the window first so the wait, bounded by the SMTP timeouts, doesn't look like a hang
+        if self._email_sending():
+            self.hide()
+            self.email_thread.wait()
+        # Same for a camera probe still opening the device
+        if self.camera_probe_thread:
+            self.camera_probe_thread.wait()
+        # Write out anything still waiting on the flush timer
+        self._flush_timer.stop()
+        self._flush_attendance()
+        self._close_smtp()
         event.accept()
 
     def show_analytics(self):
@@ -40,11 +40,12 @@ a = Analysis(
     binaries=[],
     datas=[
         ('icons/*', 'icons'),
+        ('styles/*', 'styles'),
         ('encodings', 'encodings'),
         ('attendance_records', 'attendance_records'),
         ('attendance_analytics', 'attendance_analytics')
     ],
-    hiddenimports=['cv2', 'face_recognition', 'numpy', 'pandas', 'matplotlib', 'seaborn'],
+    hiddenimports=['cv2', 'face_recognition', 'dlib', 'numpy', 'pandas', 'matplotlib', 'seaborn', 'orjson'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
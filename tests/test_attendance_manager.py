@@ -0,0 +1,245 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+pytest.importorskip("orjson")
+pytest.importorskip("seaborn")
+pytest.importorskip("PyQt5.QtWidgets")
+
+from PyQt5.QtWidgets import QApplication
+
+# attendance_manager selects the Qt5Agg backend on import, which matplotlib refuses
+# on a headless machine unless a QApplication is already running
+_app = QApplication.instance() or QApplication([])
+
+from attendance_manager import AttendanceManager
+
+ROSTER = ["Alice", "Bob", "Carol"]
+# Days before today of each record, with who was present
+RECORDS = {
+    0: ["Alice", "Bob"],
+    3: ["Alice"],
+    10: ["Bob", "Carol"],
+    40: ["Alice", "Carol"],
+    200: [],
+}
+
+
+def write_record(attendance_dir, date, present, all_students=ROSTER):
+    """Write an attendance file the way the app did before the in-memory index"""
+    date_str = date.strftime('%Y-%m-%d')
+    path = os.path.join(attendance_dir, f'attendance_{date_str}.json')
+    with open(path, 'w') as f:
+        json.dump({
+            'date': date_str,
+            'present_students': present,
+            'all_students': all_students,
+            'absent_students': [name for name in all_students if name not in present],
+            'total_students': len(all_students),
+            'present_count': len(present),
+            'attendance_percentage': len(present) / len(all_students) * 100,
+        }, f)
+    return path
+
+
+def bump_mtime(path, seconds=10):
+    """Move a file's mtime forward, so the edit is visible even on coarse clocks"""
+    mtime_ns = os.stat(path).st_mtime_ns + seconds * 10**9
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def reference_stats(attendance_dir, student_name):
+    """Per-file reading of one student's stats, as get_student_attendance_stats used to do it"""
+    history = []
+    for filename in sorted(os.listdir(attendance_dir)):
+        with open(os.path.join(attendance_dir, filename)) as f:
+            attendance = json.load(f)
+        history.append((datetime.strptime(attendance['date'], '%Y-%m-%d'),
+                        student_name in attendance['present_students']))
+    history.sort()
+    days_present = sum(present for _, present in history)
+    return {
+        'total_days': len(history),
+        'days_present': days_present,
+        'days_absent': len(history) - days_present,
+        'attendance_percentage': days_present / len(history) * 100,
+        'attendance_history': {'date': [d for d, _ in history], 'present': [p for _, p in history]},
+    }
+
+
+def reference_counts(attendance_dir, period):
+    """Per-file period filter, as get_daily_attendance_counts used to do it"""
+    max_days = {"weekly": 7, "monthly": 30, "semester": 180}[period]
+    rows = []
+    for filename in os.listdir(attendance_dir):
+        with open(os.path.join(attendance_dir, filename)) as f:
+            attendance = json.load(f)
+        date = datetime.strptime(attendance['date'], '%Y-%m-%d')
+        if (datetime.now() - date).days <= max_days:
+            rows.append((date, attendance['present_count']))
+    rows.sort()
+    return [d for d, _ in rows], [c for _, c in rows]
+
+
+@pytest.fixture
+def today():
+    return datetime.combine(datetime.now().date(), datetime.min.time())
+
+
+@pytest.fixture
+def manager(tmp_path, today):
+    manager = AttendanceManager(str(tmp_path))
+    for days_ago, present in RECORDS.items():
+        write_record(manager.attendance_dir, today - timedelta(days=days_ago), present)
+    return manager
+
+
+@pytest.mark.parametrize("student_name", ROSTER + ["Nobody"])
+def test_student_stats_match_per_file_reading(manager, student_name):
+    stats = manager.get_student_attendance_stats(student_name)
+
+    expected = reference_stats(manager.attendance_dir, student_name)
+    history = stats.pop('attendance_history')
+    expected_history = expected.pop('attendance_history')
+    assert stats == pytest.approx(expected)
+    assert [d.to_pydatetime() for d in history['date']] == expected_history['date']
+    assert history['present'] == expected_history['present']
+
+
+def test_student_stats_date_range(manager, today):
+    start = (today - timedelta(days=10)).strftime('%Y-%m-%d')
+    end = (today - timedelta(days=3)).strftime('%Y-%m-%d')
+
+    stats = manager.get_student_attendance_stats("Alice", start, end)
+
+    assert stats['total_days'] == 2
+    assert stats['days_present'] == 1
+
+
+def test_student_stats_empty_range(manager, today):
+    start = today + timedelta(days=1)
+
+    assert manager.get_student_attendance_stats("Alice", start_date=start) is None
+
+
+@pytest.mark.parametrize("period", ["weekly", "monthly", "semester"])
+def test_period_filters_match_per_file_reading(manager, period):
+    dates, counts = manager.get_daily_attendance_counts(period)
+
+    expected_dates, expected_counts = reference_counts(manager.attendance_dir, period)
+    assert [d.to_pydatetime() for d in dates] == expected_dates
+    assert counts == expected_counts
+
+
+def test_trend_without_period_covers_every_record(manager):
+    trend = manager.get_attendance_trend()
+
+    assert len(trend['dates']) == len(RECORDS)
+    assert trend['dates'] == sorted(trend['dates'])
+
+
+def spy_reads(monkeypatch, manager):
+    """Record the paths _load_all actually reads from disk"""
+    reads = []
+    read_record = AttendanceManager._read_record
+
+    def spy(path):
+        reads.append(path)
+        return read_record(path)
+
+    monkeypatch.setattr(manager, '_read_record', spy)
+    return reads
+
+
+def test_unchanged_files_are_not_reread(monkeypatch, manager):
+    first = manager._load_all()
+    reads = spy_reads(monkeypatch, manager)
+
+    assert manager._load_all() is first
+    assert reads == []
+
+
+def test_edited_file_is_reread_alone(monkeypatch, manager, today):
+    manager._load_all()
+    reads = spy_reads(monkeypatch, manager)
+
+    path = write_record(manager.attendance_dir, today - timedelta(days=3), ["Alice", "Bob", "Carol"])
+    bump_mtime(path)
+    days, student_ids, presence = manager._load_all()
+
+    assert reads == [path]
+    row = days.index[days['date'] == today - timedelta(days=3)][0]
+    assert days['present_count'][row] == 3
+    assert presence[row, student_ids["Carol"]]
+
+
+def test_added_file_is_read_alone(monkeypatch, manager, today):
+    manager._load_all()
+    reads = spy_reads(monkeypatch, manager)
+
+    path = write_record(manager.attendance_dir, today - timedelta(days=1), ["Dave"], ROSTER + ["Dave"])
+    bump_mtime(path)
+    days, student_ids, presence = manager._load_all()
+
+    assert reads == [path]
+    assert len(days) == len(RECORDS) + 1
+    assert list(days['date']) == sorted(days['date'])
+    assert presence[:, student_ids["Dave"]].sum() == 1
+
+
+def test_removed_file_drops_out(manager, today):
+    manager._load_all()
+
+    assert manager.clear_attendance(today - timedelta(days=40))
+
+    days, _, _ = manager._load_all()
+    assert len(days) == len(RECORDS) - 1
+
+
+def test_save_attendance_round_trips(manager, today):
+    date = today + timedelta(days=1)
+    present = {"Alice": "09:00:00", "Carol": "09:05:00"}
+
+    manager.save_attendance(date, present, iter(ROSTER))
+
+    record = manager.get_attendance(date)
+    assert record['present_students'] == ["Alice", "Carol"]
+    assert record['all_students'] == ROSTER
+    assert record['absent_students'] == ["Bob"]
+    assert record['present_count'] == 2
+    assert record['total_students'] == 3
+    assert record['attendance_percentage'] == pytest.approx(200 / 3)
+    stats = manager.get_student_attendance_stats("Carol")
+    assert stats['attendance_history']['present'][-1]
+
+
+def test_save_attendance_bumps_revision_and_notifies(manager, today):
+    changes = []
+    manager.add_change_listener(changes.append)
+    revision = manager.revision
+    manager._load_all()
+
+    manager.save_attendance(today, ["Carol"], ROSTER)
+
+    assert manager.revision == revision + 1
+    assert changes == [today.strftime('%Y-%m-%d')]
+    days, student_ids, presence = manager._load_all()
+    assert presence[len(days) - 1, student_ids["Carol"]]
+    assert days['present_count'].iloc[-1] == 1
+
+
+def test_invalidate_all_notifies_with_none(manager):
+    changes = []
+    manager.add_change_listener(changes.append)
+    revision = manager.revision
+
+    manager.invalidate_cache()
+
+    assert manager.revision == revision + 1
+    assert changes == [None]
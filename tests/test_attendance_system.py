@@ -0,0 +1,174 @@
+import os
+import pickle
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("face_recognition")
+pytest.importorskip("PyQt5.QtWidgets")
+
+from PyQt5.QtWidgets import QApplication
+
+import face1
+
+
+@pytest.fixture
+def window(monkeypatch, tmp_path):
+    # Keep a QApplication alive for the widgets; reuse one if another test made it
+    app = QApplication.instance() or QApplication([])
+    # Loading a dataset confirms with a modal box, which would block the test
+    monkeypatch.setattr(face1.QMessageBox, "information", lambda *args, **kwargs: None)
+    # Datasets and attendance records go to tmp_path, not the checkout
+    window = face1.AttendanceSystem(base_dir=str(tmp_path))
+    yield window
+    window.close()
+
+
+def test_record_student_after_loading_dataset(window):
+    encodings = np.zeros((3, 128), dtype=np.float32)
+    window.on_encoding_set_loaded("class_a", encodings, ["Alice", "Alice", "Bob"])
+
+    window.update_attendance_record("Alice", "2024-01-01 09:00:00")
+
+    assert window.present_students == {"Alice": "2024-01-01 09:00:00"}
+    assert window._absent_names == {"Bob"}
+    assert window.attendance_table.rowCount() == 1
+
+
+@pytest.fixture
+def saves(window, monkeypatch):
+    """Record the calls the window makes to save_attendance instead of writing them"""
+    calls = []
+    monkeypatch.setattr(window.attendance_manager, "save_attendance",
+                        lambda date, present, roster: calls.append((dict(present), list(roster))))
+    return calls
+
+
+def test_flush_coalesces_recognitions_into_one_save(window, saves):
+    window.on_encoding_set_loaded("class_a", np.zeros((3, 128), dtype=np.float32), ["Alice", "Bob", "Carol"])
+
+    window.update_attendance_record("Alice", "2024-01-01 09:00:00")
+    window.update_attendance_record("Bob", "2024-01-01 09:00:01")
+
+    assert window._flush_timer.isActive()
+    assert saves == []
+
+    # What the timer does when it fires; a second flush has nothing new to write
+    window._flush_attendance()
+    window._flush_attendance()
+
+    assert saves == [({"Alice": "2024-01-01 09:00:00", "Bob": "2024-01-01 09:00:01"},
+                      ["Alice", "Bob", "Carol"])]
+
+
+def test_clear_attendance_cancels_pending_save(window, saves, monkeypatch):
+    monkeypatch.setattr(face1.QMessageBox, "question", lambda *args, **kwargs: face1.QMessageBox.Yes)
+    window.on_encoding_set_loaded("class_a", np.zeros((2, 128), dtype=np.float32), ["Alice", "Bob"])
+    window.update_attendance_record("Alice", "2024-01-01 09:00:00")
+
+    window.clear_attendance()
+    window._flush_attendance()
+
+    assert not window._flush_timer.isActive()
+    assert saves == []
+    assert window.present_students == {}
+    assert window._absent_names == {"Alice", "Bob"}
+    assert window.attendance_table.rowCount() == 0
+
+
+def make_gallery(rng, count=50):
+    """Unit-scale random encodings, spread like real face descriptors"""
+    known = rng.normal(scale=0.1, size=(count, 128))
+    return known, [f"Student{i}" for i in range(count)]
+
+
+def reference_names(known, names, probes, threshold):
+    """Nearest known face by face_recognition.face_distance, one probe at a time"""
+    result = []
+    for probe in probes:
+        distances = face1.face_recognition.face_distance(known, probe)
+        best = int(np.argmin(distances))
+        result.append(names[best] if distances[best] < threshold else "Unknown")
+    return result
+
+
+@pytest.mark.parametrize("threshold", [0.3, 0.45, 0.6])
+def test_match_faces_agrees_with_face_distance(threshold):
+    rng = np.random.default_rng(0)
+    known, names = make_gallery(rng)
+    # Noisy copies of known faces at a range of distances, plus strangers
+    noise = rng.normal(size=(40, 128)) * rng.uniform(0.0, 0.06, size=(40, 1))
+    probes = np.vstack([known[rng.integers(0, len(known), 40)] + noise,
+                        rng.normal(scale=0.1, size=(10, 128))])
+    thread = face1.FaceRecognitionThread(known, names, threshold)
+
+    recognised = thread.match_faces(list(probes))
+
+    assert recognised == reference_names(known, names, probes, threshold)
+    assert "Unknown" in recognised
+    assert set(recognised) != {"Unknown"}
+
+
+def test_match_faces_without_faces_or_gallery():
+    known, names = make_gallery(np.random.default_rng(1))
+
+    assert face1.FaceRecognitionThread(known, names).match_faces([]) == []
+    assert face1.FaceRecognitionThread([], []).match_faces([known[0]]) == ["Unknown"]
+
+
+def test_saved_dataset_round_trips(window, tmp_path, monkeypatch):
+    monkeypatch.setattr(face1.QMessageBox, "critical", lambda *args: pytest.fail(args[2]))
+    encodings = list(np.random.default_rng(2).normal(scale=0.1, size=(3, 128)))
+    dataset_path = tmp_path / "class_a"
+    dataset_path.mkdir()
+
+    window.save_encoding_set(str(dataset_path), "class_a", "", encodings, ["Alice", "Bob", "Alice"], 3, "")
+    loaded, names = face1.read_encoding_file(str(dataset_path / "encodings.npz"))
+    no_encodings, names_only = face1.read_encoding_file(str(dataset_path / "encodings.npz"), names_only=True)
+
+    assert names == names_only == ["Alice", "Bob", "Alice"]
+    assert no_encodings is None
+    assert loaded.shape == (3, 128)
+    # Stored at half precision
+    np.testing.assert_allclose(loaded, encodings, atol=1e-3)
+
+
+def test_reads_legacy_pickle_datasets(tmp_path):
+    encodings = [np.full(128, 0.5), np.full(128, -0.5)]
+    encoding_file = str(tmp_path / "encodings.pkl")
+    with open(encoding_file, "wb") as f:
+        pickle.dump({"encodings": encodings, "names": ["Alice", "Bob"]}, f)
+
+    loaded, names = face1.read_encoding_file(encoding_file)
+    no_encodings, names_only = face1.read_encoding_file(encoding_file, names_only=True)
+
+    assert names == names_only == ["Alice", "Bob"]
+    assert no_encodings is None
+    np.testing.assert_array_equal(np.asarray(loaded), encodings)
+
+
+def test_image_cache_round_trips_outside_the_image_folder(tmp_path):
+    images = tmp_path / "photos"
+    images.mkdir()
+    face1.cv2.imwrite(str(images / "Alice_1.jpg"), np.zeros((32, 32, 3), dtype=np.uint8))
+    cache_dir = str(tmp_path / "cache")
+    thread = face1.LoadStudentsThread(str(images), cache_dir)
+
+    thread.run()
+    cache = thread._load_cache()
+
+    # The blank image has no face, which is cached too so it isn't retried
+    assert list(cache.values()) == [None]
+    assert [key[0] for key in cache] == [str(images / "Alice_1.jpg")]
+    assert os.listdir(images) == ["Alice_1.jpg"]
+
+    encoding = np.random.default_rng(3).normal(size=128)
+    other = str(tmp_path / "elsewhere" / "Bob_1.jpg")
+    thread._save_cache({(other, 1, 2): encoding, **cache})
+    reloaded = thread._load_cache()
+
+    np.testing.assert_array_equal(reloaded[(other, 1, 2)], encoding)
+    assert reloaded.keys() == {(other, 1, 2), *cache}